@@ -174,6 +174,35 @@ def mock_arranger_deps():
 @pytest.fixture(autouse=True)
 def clear_caches():
     # Clear lru_caches to ensure mocks are used
-    from wildcards_gen.core.wordnet import get_primary_synset
+    from wildcards_gen.core import wordnet
+    from wildcards_gen.core.wordnet import (
+        get_primary_synset,
+        get_synset_gloss,
+        get_synset_name,
+    )
 
     get_primary_synset.cache_clear()
+    get_synset_name.cache_clear()
+    get_synset_gloss.cache_clear()
+    # Drop the bound reader so a patched `wn` is picked up
+    wordnet._WN_READY = False
+    wordnet._synset_from_pos_and_offset = None
+
+
+@pytest.fixture(autouse=True)
+def no_llm_response_cache(monkeypatch):
+    # Handlers must reach the mocked engine; cache tests use their own database
+    from wildcards_gen.core.config import config
+
+    monkeypatch.setattr(config, "llm_cache_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_paths(monkeypatch, tmp_path):
+    # Persistent caches and served downloads must not touch the real locations
+    from wildcards_gen.core import linter
+    from wildcards_gen.core.config import config
+
+    monkeypatch.setattr(config, "db_path", str(tmp_path / "cache.db"))
+    linter._TERM_VECTORS.clear()
+    monkeypatch.setenv("GRADIO_TEMP_DIR", str(tmp_path / "gradio"))
@@ -237,6 +237,19 @@ class TestArranger(unittest.TestCase):
             self.assertTrue(any(k.startswith("bird") for k in keys))
             self.assertEqual(len(keys), 2)
 
+    @patch("wildcards_gen.core.arranger.get_primary_synset", return_value=None)
+    def test_descriptive_name_finds_medoid_once(self, mock_synset):
+        """The medoid feeds both the hypernym lookup and LCA validation but is computed once."""
+        from wildcards_gen.core import arranger
+
+        embeddings = np.array([[0.0, 0.0], [1.0, 1.0], [4.0, 4.0]])
+        terms = ["near", "middle", "far"]
+        with patch("wildcards_gen.core.arranger.euclidean_distances", wraps=arranger.euclidean_distances) as distances:
+            _, meta = arranger._generate_descriptive_name("fruit", embeddings, terms)
+
+        distances.assert_called_once()
+        self.assertEqual(meta["medoid_term"], "middle")
+
 
 if __name__ == "__main__":
     unittest.main()
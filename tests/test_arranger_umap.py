@@ -1,4 +1,5 @@
-from unittest.mock import patch
+import sys
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 
@@ -28,6 +29,27 @@ def test_compute_umap_embeddings_success(mock_arranger_deps):
     assert result.shape == (20, 5)
 
 
+def test_compute_umap_embeddings_prefers_cuml(mock_arranger_deps):
+    """With RAPIDS installed the GPU UMAP is used with the same settings."""
+    cuml = MagicMock()
+    gpu_umap = cuml.manifold.UMAP
+    gpu_umap.return_value.fit_transform.return_value = np.zeros((20, 5))
+
+    with patch.dict(sys.modules, {"cuml": cuml, "cuml.manifold": cuml.manifold}):
+        result = compute_umap_embeddings(np.random.rand(20, 384))
+
+    gpu_umap.assert_called_once_with(
+        n_neighbors=15,
+        n_components=5,
+        min_dist=0.1,
+        metric="cosine",
+        random_state=42,
+        output_type="numpy",
+    )
+    mock_arranger_deps["umap"].UMAP.assert_not_called()
+    assert result.shape == (20, 5)
+
+
 def test_compute_umap_embeddings_fallback_small_data(mock_arranger_deps):
     """Test fallback when sample size < n_neighbors."""
     embeddings = np.random.rand(10, 384)  # 10 samples < 15 neighbors
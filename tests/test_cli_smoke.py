@@ -47,3 +47,10 @@ def test_cli_semantic_arrange_args():
     ]
     result_import = subprocess.run(cmd_import, capture_output=True, text=True)
     assert result_import.returncode == 0, f"Import check failed: {result_import.stderr}"
+
+
+def test_cli_import_does_not_load_nltk():
+    """Dataset modules (and NLTK with them) load only when a dataset command runs."""
+    code = "import sys, wildcards_gen.cli; sys.exit('nltk' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -15,6 +15,18 @@ def test_traversal_budget():
     assert not budget.consume(1)
 
 
+def test_traversal_budget_reports_progress():
+    progress = MagicMock()
+    budget = TraversalBudget(None, progress_callback=progress, total=600)
+
+    for _ in range(600):
+        assert budget.consume()
+
+    # First node, then once every PROGRESS_EVERY nodes
+    assert [c.args[0] for c in progress.call_args_list] == [(1, 600), (251, 600), (501, 600)]
+    assert progress.call_args.kwargs["desc"] == "Extracting hierarchy: 501 nodes"
+
+
 @patch("wildcards_gen.core.datasets.imagenet.ensure_imagenet_1k_data")
 def test_imagenet_limit(mock_ensure):
     # Setup mock WordNet hierarchy
@@ -82,7 +94,10 @@ def test_tencent_limit(mock_get_synset, mock_parse, mock_dl):
 
     mock_parse.return_value = (categories, children_map, [0])
 
-    result = tencent.generate_tencent_hierarchy(preview_limit=3)
+    progress = MagicMock()
+    result = tencent.generate_tencent_hierarchy(preview_limit=3, progress_callback=progress)
     assert result is not None
     assert result.name == "Root"
     assert len(result.children) <= 3
+    # The preview limit, not the category count, bounds the reported total
+    progress.assert_called_with((1, 3), desc="Extracting hierarchy: 1 nodes")
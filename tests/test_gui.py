@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+import time
 from unittest.mock import MagicMock, mock_open, patch
 
 # We don't hack sys.modules anymore because other tests load real gradio
@@ -8,12 +12,11 @@ def test_generate_dataset_handler_logic():
     """Test the generation wrapper function logic."""
     with (
         patch("wildcards_gen.core.datasets.imagenet.generate_imagenet_tree") as mock_img,
-        patch("wildcards_gen.gui.StructureManager") as mock_mgr_cls,
-        patch("builtins.open", mock_open()) as mocked_file,
+        patch("wildcards_gen.gui._structure_manager"),
+        patch("builtins.open", mock_open(read_data="root:\n- child\n")) as mocked_file,
         patch("os.makedirs"),
+        patch("os.replace"),
     ):
-        mock_mgr = mock_mgr_cls.return_value
-        mock_mgr.to_string.return_value = "root:\n- child"
         mock_img.return_value = {"root": ["child"]}
 
         content, summary, files = gui.generate_dataset_handler(
@@ -48,9 +51,8 @@ def test_generate_dataset_handler_logic():
 
 def test_generate_dataset_handler_error():
     """Test error handling in generation."""
-    # We patch inside gui.py's namespace for consistency
     with patch(
-        "wildcards_gen.gui.imagenet.generate_imagenet_tree",
+        "wildcards_gen.core.datasets.imagenet.generate_imagenet_tree",
         side_effect=Exception("Boom"),
     ):
         content, summary, files = gui.generate_dataset_handler(
@@ -80,16 +82,51 @@ def test_generate_dataset_handler_error():
         assert "Boom" in content
 
 
+def test_generate_dataset_stream_yields_progress_then_result():
+    """The streaming wrapper relays worker progress and ends with the handler result."""
+
+    def fake_handler(*args, progress):
+        progress(0.5, desc="Building tree...")
+        return "yaml", "done", ["out.yaml"]
+
+    with patch("wildcards_gen.gui.generate_dataset_handler", side_effect=fake_handler):
+        results = list(gui.generate_dataset_stream("ImageNet", "Standard"))
+
+    assert results[-1] == ("yaml", "done", ["out.yaml"])
+    assert any("Building tree..." in str(r[1]) for r in results[:-1])
+
+
+def test_closing_generate_dataset_stream_stops_the_worker():
+    """A disconnected client does not wait for, or keep running, the build."""
+    import threading
+
+    stopped = threading.Event()
+
+    def fake_handler(*args, progress):
+        try:
+            while True:
+                progress(0.5, desc="Building tree...")
+                time.sleep(0.01)
+        finally:
+            stopped.set()
+
+    with patch("wildcards_gen.gui.generate_dataset_handler", side_effect=fake_handler):
+        stream = gui.generate_dataset_stream("ImageNet", "Standard")
+        next(stream)
+        stream.close()
+
+    assert stopped.wait(timeout=5)
+
+
 def test_generate_dataset_handler_openimages():
     """Test OpenImages handler passing bbox_only."""
     with (
         patch("wildcards_gen.core.datasets.openimages.generate_openimages_hierarchy") as mock_oi,
-        patch("wildcards_gen.gui.StructureManager") as mock_mgr_cls,
+        patch("wildcards_gen.gui._structure_manager"),
         patch("builtins.open", mock_open()),
         patch("os.makedirs"),
+        patch("os.replace"),
     ):
-        mock_mgr = mock_mgr_cls.return_value
-        mock_mgr.to_string.return_value = "res"
         mock_oi.return_value = {}
 
         # Test valid call with bbox_only=True
@@ -127,17 +164,17 @@ def test_generate_dataset_handler_openimages():
 def test_create_handler_logic():
     """Test the LLM create handler logic."""
     with (
-        patch("wildcards_gen.gui.LLMEngine") as mock_engine_cls,
-        patch("wildcards_gen.gui.StructureManager") as mock_mgr_cls,
-        patch("builtins.open", mock_open()),
+        patch("wildcards_gen.gui._llm_engine") as mock_engine_cls,
+        patch("wildcards_gen.gui._structure_manager") as mock_mgr_cls,
+        patch("builtins.open", mock_open(read_data="topic:\n- item\n")),
         patch("os.makedirs"),
+        patch("os.replace"),
     ):
         mock_engine = mock_engine_cls.return_value
         mock_engine.generate_dynamic_structure.return_value = "topic:\n- item"
 
         mock_mgr = mock_mgr_cls.return_value
         mock_mgr.from_string.return_value = {"topic": ["item"]}
-        mock_mgr.to_string.return_value = "topic:\n- item"
 
         path, content = gui.create_handler("Topic", "model", "key", "out.yaml")
 
@@ -202,13 +239,11 @@ def test_lint_handler_logic():
     with (
         patch("wildcards_gen.core.linter.lint_file") as mock_lint,
         patch("wildcards_gen.core.linter.clean_structure") as mock_clean,
-        patch("wildcards_gen.gui.StructureManager") as mock_mgr_cls,
+        patch("wildcards_gen.gui._structure_manager") as mock_mgr_cls,
         patch("builtins.open", mock_open()),
-        patch("os.path.dirname", return_value="/tmp"),
-        patch("os.path.basename", return_value="test.yaml"),
     ):
         mock_file = MagicMock()
-        mock_file.name = "test.yaml"
+        mock_file.name = "/tmp/test.yaml"
 
         # Scenario: Outliers found
         mock_lint.return_value = (
@@ -217,15 +252,234 @@ def test_lint_handler_logic():
         )
         mock_clean.return_value = {"a": ["y"]}
         mock_mgr = mock_mgr_cls.return_value
-        mock_mgr.to_string.return_value = "cleaned_content"
 
         report, vis_update, path = gui.lint_handler(mock_file, "qwen3", 0.1)
 
+        mock_mgr.to_file.assert_called_once()
+        assert mock_mgr.to_file.call_args[0][0] == {"a": ["y"]}
+
         assert "Found 1 Potential Outliers" in report
         assert vis_update["visible"] is True
-        assert "cleaned.yaml" in path
+        assert path == "/tmp/test_cleaned.yaml"
 
         # Scenario: No file
         report, vis_update, path = gui.lint_handler(None, "qwen3", 0.1)
         assert "Error" in report
         assert vis_update["visible"] is False
+
+
+def test_structure_manager_reused_per_thread():
+    """Handlers share one manager per thread but never across threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    mgr = gui._structure_manager()
+    assert gui._structure_manager() is mgr
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(gui._structure_manager).result() is not mgr
+
+
+def test_save_and_preview_truncates_long_output(tmp_path):
+    """The full structure is written to disk but the preview is capped."""
+    data = {"items": [f"item{i}" for i in range(gui.PREVIEW_MAX_LINES * 2)]}
+    with patch("wildcards_gen.gui.config") as mock_config:
+        mock_config.output_dir = str(tmp_path)
+        path, preview = gui.save_and_preview(data, "big")
+
+    assert path.endswith("big.yaml")
+    with open(path, encoding="utf-8") as f:
+        assert f.read().count("- item") == gui.PREVIEW_MAX_LINES * 2
+    # Preview lines, a blank separator, then the truncation notice
+    assert len(preview.splitlines()) == gui.PREVIEW_MAX_LINES + 2
+    assert preview.endswith("Download file to view full content.)")
+
+
+def test_save_and_preview_serves_output_from_gradio_folder(tmp_path):
+    """The returned download is a link inside Gradio's folder, so it is not copied again."""
+    saved = tmp_path / "out" / "small.yaml"
+    with patch("wildcards_gen.gui.config") as mock_config:
+        mock_config.output_dir = str(tmp_path / "out")
+        path, _ = gui.save_and_preview({"a": ["b"]}, "small")
+        assert path.startswith(gui.gr.utils.get_upload_folder())
+        assert os.path.samefile(path, saved)
+
+        # Saving again serves a new link; the earlier one keeps its bytes
+        with open(path, "rb") as f:
+            first_bytes = f.read()
+        again, _ = gui.save_and_preview({"a": ["c"]}, "small")
+        assert again != path
+        assert os.path.samefile(again, saved)
+        with open(path, "rb") as f:
+            assert f.read() == first_bytes
+        assert gui._served_path(str(saved)) == again
+
+        # Previews are never offered for download, so nothing is linked
+        path, _ = gui.save_and_preview({"a": ["b"]}, "small", serve=False)
+        assert path == str(saved)
+
+        # Without link support the output itself is returned
+        with patch("os.link", side_effect=OSError("cross-device link")):
+            path, _ = gui.save_and_preview({"a": ["b"]}, "small")
+        assert path == str(saved)
+
+
+def test_served_links_are_pruned_oldest_first(tmp_path):
+    """Only the most recent SERVED_LINKS_KEPT link folders are kept."""
+    served = []
+    with patch.object(gui, "SERVED_LINKS_KEPT", 2):
+        for i in range(4):
+            source = tmp_path / f"out{i}.yaml"
+            source.write_text(str(i), encoding="utf-8")
+            served.append(gui._served_path(str(source)))
+            # Folder mtimes order the pruning; keep them distinct
+            os.utime(os.path.dirname(served[-1]), ns=(i * 10**9, i * 10**9))
+
+    assert [os.path.exists(path) for path in served] == [False, False, True, True]
+
+
+def test_search_wordnet_caches_normalized_query(mock_synset_factory):
+    """Repeat searches differing only in case reuse the first lookup."""
+    dog = mock_synset_factory("hot_dog.n.01", ["hot_dog"])
+    dog.definition.return_value = "a frankfurter served hot on a bun"
+    gui._wordnet_choices.cache_clear()
+
+    # Explicit mock: letting patch() inspect the lazy corpus would load WordNet
+    mock_wn = MagicMock()
+    mock_wn.synsets.return_value = [dog]
+    with (
+        patch("nltk.corpus.wordnet", mock_wn),
+        patch("wildcards_gen.core.wordnet.ensure_nltk_data") as ensure,
+    ):
+        dropdown, message = gui.search_wordnet("Hot Dog")
+        gui.search_wordnet("hot dog")
+
+    mock_wn.synsets.assert_called_once_with("hot_dog")
+    ensure.assert_called_once()
+    assert dropdown["choices"][0][1] == "hot_dog.n.01"
+    assert "a frankfurter" in dropdown["choices"][0][0]
+    gui._wordnet_choices.cache_clear()
+
+
+def test_update_cat_filename_uses_first_term():
+    assert gui.update_cat_filename("Golden Retriever!\nbeagle\npug") == "categorized_golden_retriever.yaml"
+    assert gui.update_cat_filename("") == "categorized.yaml"
+
+
+def test_llm_engine_cached_per_key_and_model():
+    gui._llm_engine.cache_clear()
+    engine = gui._llm_engine("key", "model-a")
+
+    assert gui._llm_engine("key", "model-a") is engine
+    assert gui._llm_engine("key", "model-b") is not engine
+    gui._llm_engine.cache_clear()
+
+
+def test_categorize_handler_parses_terms_once():
+    """Blank and whitespace-only lines are dropped, others are stripped."""
+    with patch("wildcards_gen.gui._llm_engine") as mock_engine_factory:
+        engine = mock_engine_factory.return_value
+        engine.generate_structure.return_value = None
+
+        path, content = gui.categorize_handler("  beagle \r\n\n   \npug\n", "model", "key", "out.yaml")
+
+    assert path is None
+    engine.generate_structure.assert_called_once_with(["beagle", "pug"])
+
+
+def test_gui_import_does_not_load_nltk():
+    """WordNet and the dataset backends load on first use, not at UI startup."""
+    code = "import sys, wildcards_gen.gui; sys.exit('nltk' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_launch_gui_warms_wordnet_in_background():
+    with (
+        patch.object(gui.gr.Blocks, "launch"),
+        patch.object(gui.gr.Blocks, "queue"),
+        patch("wildcards_gen.gui.threading.Thread") as thread,
+    ):
+        gui.launch_gui()
+
+    # Gradio starts threads of its own; ours is the one targeting the warm-up
+    targets = [c.kwargs.get("target") for c in thread.call_args_list]
+    assert targets.count(gui._warm_wordnet) == 1
+    thread.return_value.start.assert_called()
+
+
+def test_live_preview_is_one_coalescing_event():
+    """All preview triggers share one always_last event, so bursts collapse to one rebuild."""
+    with (
+        patch.object(gui.gr.Blocks, "launch", autospec=True) as launch,
+        patch.object(gui.gr.Blocks, "queue"),
+    ):
+        gui.launch_gui()
+
+    demo = launch.call_args[0][0]
+    events = [f for f in demo.fns.values() if f.fn is gui.live_preview_handler]
+    assert len(events) == 1
+    assert len(events[0].targets) == 13
+    assert events[0].trigger_mode == "always_last"
+    assert events[0].concurrency_limit == 1
+
+
+def test_wordnet_search_is_one_unqueued_event():
+    with (
+        patch.object(gui.gr.Blocks, "launch", autospec=True) as launch,
+        patch.object(gui.gr.Blocks, "queue"),
+    ):
+        gui.launch_gui()
+
+    demo = launch.call_args[0][0]
+    events = [f for f in demo.fns.values() if f.fn is gui.search_wordnet]
+    assert len(events) == 1
+    assert len(events[0].targets) == 2
+    assert events[0].concurrency_limit is None
+
+
+def test_gui_disables_gradio_analytics():
+    with (
+        patch.object(gui.gr.Blocks, "launch", autospec=True) as launch,
+        patch.object(gui.gr.Blocks, "queue"),
+    ):
+        gui.launch_gui()
+
+    assert launch.call_args[0][0].analytics_enabled is False
+
+
+def test_generate_dataset_handler_serves_all_outputs_from_gradio_folder(tmp_path):
+    """The YAML and its stats files are all handed to Gradio as in-folder links."""
+    with (
+        patch("wildcards_gen.core.datasets.imagenet.generate_imagenet_tree", return_value={"root": ["child"]}),
+        patch.object(gui.config, "output_dir", str(tmp_path)),
+    ):
+        _, _, files = gui.generate_dataset_handler(
+            "ImageNet", "Standard", "entity.n.01", 3, "out.yaml", True, "none", True, False,
+            6, 10, 3, False, False, None, None, 0.1, False, 0.1, 5,
+        )  # fmt: skip
+
+    folder = gui.gr.utils.get_upload_folder()
+    assert [os.path.basename(f) for f in files] == ["out.yaml", "out.log", "out.stats.json"]
+    for served in files:
+        assert served.startswith(folder)
+        assert os.path.samefile(served, tmp_path / os.path.basename(served))
+
+
+def test_rewriting_stats_leaves_served_links_intact(tmp_path):
+    """Stats are replaced, not rewritten in place, so earlier downloads keep their content."""
+    from wildcards_gen.core.stats import StatsCollector
+
+    stats = StatsCollector()
+    stats.log_event("info", "first run")
+    for path, save in (
+        (tmp_path / "out.log", stats.save_summary_log),
+        (tmp_path / "out.stats.json", stats.save_to_json),
+    ):
+        save(str(path))
+        served = tmp_path / f"served{path.suffix}"
+        os.link(path, served)
+
+        stats.log_event("info", "second run")
+        save(str(path))
+        assert "second run" in path.read_text(encoding="utf-8")
+        assert "second run" not in served.read_text(encoding="utf-8")
+        stats.events.pop()
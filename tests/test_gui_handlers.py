@@ -4,6 +4,8 @@ GUI Handlers Unit Tests.
 Tests the logic inside gui.py handlers without launching Gradio.
 """
 
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -11,8 +13,11 @@ from wildcards_gen import gui
 
 
 class TestGUIHandlers(unittest.TestCase):
+    def setUp(self):
+        gui._ANALYSIS_CACHE.clear()
+
     @patch("wildcards_gen.gui.save_and_preview")
-    @patch("wildcards_gen.gui.imagenet.generate_imagenet_tree")
+    @patch("wildcards_gen.core.datasets.imagenet.generate_imagenet_tree")
     def test_generate_dataset_delegation(self, mock_gen, mock_save):
         """Test dataset handler calls correct generator logic."""
         mock_save.return_value = ("path", "content")
@@ -81,6 +86,9 @@ class TestGUIHandlers(unittest.TestCase):
         mock_stats_obj.total_nodes = 100
         mock_stats_obj.total_leaves = 50
         mock_stats_obj.to_dict.return_value = {
+            "max_depth": 5,
+            "total_nodes": 100,
+            "total_leaves": 50,
             "avg_branching": 2.0,
             "avg_leaf_size": 5.0,
         }
@@ -99,6 +107,49 @@ class TestGUIHandlers(unittest.TestCase):
         self.assertEqual(d, 4)
         self.assertEqual(h, 50)
         self.assertEqual(l, 5)
+        # Traversal progress reaches the Gradio progress bar
+        self.assertIn("progress_callback", mock_gen.call_args.kwargs)
+
+        # Re-running with the same inputs reuses the analysis; depths below 10 build the same tree
+        gui.analyze_handler("ImageNet", "root.n.01", 3, "none", True, False, True, [])
+        mock_gen.assert_called_once()
+        gui.analyze_handler("ImageNet", "other.n.01", 10, "none", True, False, False, [])
+        self.assertEqual(mock_gen.call_count, 2)
+
+        # A fresh process finds the summary in the database instead of re-traversing
+        gui._ANALYSIS_CACHE.clear()
+        report, d, h, l, hist, stale = gui.analyze_handler("ImageNet", "root.n.01", 10, "none", True, False, False, [])
+        self.assertEqual(mock_gen.call_count, 2)
+        self.assertIn("**Total Nodes**: 100", report)
+        self.assertEqual((d, h, l), (4, 50, 5))
+
+    @patch("wildcards_gen.core.analyze.compute_dataset_stats")
+    @patch("wildcards_gen.core.analyze.suggest_thresholds", return_value={})
+    @patch("wildcards_gen.core.datasets.tencent.generate_tencent_hierarchy")
+    def test_analyze_handler_reruns_when_source_file_changes(self, mock_gen, mock_suggest, mock_stats):
+        """An edited dataset file is analyzed again instead of served from the store."""
+        mock_stats.return_value.to_dict.return_value = {
+            "max_depth": 5,
+            "total_nodes": 100,
+            "total_leaves": 50,
+            "avg_branching": 2.0,
+            "avg_leaf_size": 5.0,
+        }
+        with tempfile.TemporaryDirectory() as downloads:
+            source = os.path.join(downloads, "tencent_hierarchy.txt")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write("a\n")
+
+            with patch("wildcards_gen.core.datasets.downloaders.DOWNLOADS_DIR", downloads):
+                gui.analyze_handler("Tencent ML-Images", "", 10, "none", True, False, False, [])
+                gui._ANALYSIS_CACHE.clear()
+                gui.analyze_handler("Tencent ML-Images", "", 10, "none", True, False, False, [])
+                mock_gen.assert_called_once()
+
+                with open(source, "a", encoding="utf-8") as f:
+                    f.write("b\n")
+                gui.analyze_handler("Tencent ML-Images", "", 10, "none", True, False, False, [])
+                self.assertEqual(mock_gen.call_count, 2)
 
 
 if __name__ == "__main__":
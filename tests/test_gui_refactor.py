@@ -25,7 +25,7 @@ class TestGUIRefactor(unittest.TestCase):
             # Case A: Fast Preview ON (True at end)
             args = ["arg1", "arg2", True]
             gui.live_preview_handler(*args)
-            mock_gen.assert_called_once()
+            mock_gen.assert_called_once_with(*args, serve=False)
 
             # Case B: Fast Preview OFF (False at end)
             mock_gen.reset_mock()
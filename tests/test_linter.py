@@ -4,6 +4,9 @@ Semantic Linter Tests.
 Tests for the linter module functionality.
 """
 
+import sys
+from unittest.mock import MagicMock, patch
+
 import numpy as np
 
 from wildcards_gen.core import linter
@@ -29,3 +32,105 @@ def test_detect_outliers_small_input(mock_arranger_deps):
     embeddings = np.array([[0.1], [0.2]])
     result = linter.detect_outliers_hdbscan(embeddings, threshold=0.1)
     assert result == []
+
+
+def test_lint_file_encodes_all_lists_in_one_batch(tmp_path):
+    """Terms from every leaf list go to the model once; each list gets its own rows."""
+    path = tmp_path / "skeleton.yaml"
+    path.write_text("a:\n- cat\n- dog\n- fish\nb:\n- dog\n- oak\n- elm\nc:\n- x\n", encoding="utf-8")
+
+    model = MagicMock()
+    model.encode.side_effect = lambda terms, **kw: np.array([[float(len(t))] for t in terms])
+    seen = []
+
+    def fake_detect(embeddings, threshold):
+        seen.append(embeddings[:, 0].tolist())
+        return [(0, 0.5)]
+
+    with (
+        patch("wildcards_gen.core.linter.check_dependencies", return_value=True),
+        patch("wildcards_gen.core.linter.load_embedding_model", return_value=model),
+        patch("wildcards_gen.core.linter.detect_outliers_hdbscan", side_effect=fake_detect),
+    ):
+        report, _ = linter.lint_file(str(path), "minilm", 0.1)
+
+    model.encode.assert_called_once()
+    assert model.encode.call_args[0][0] == ["cat", "dog", "fish", "oak", "elm"]
+    assert seen == [[3.0, 3.0, 4.0], [3.0, 3.0, 3.0]]
+    assert [issue["path"] for issue in report["issues"]] == ["a", "b"]
+    assert report["issues"][1]["outliers"][0]["term"] == "dog"
+
+
+def test_build_embedding_model_uses_fp16_on_cuda_only():
+    st = MagicMock()
+    with patch.dict(sys.modules, {"sentence_transformers": st}):
+        st.SentenceTransformer.return_value.device.type = "cuda"
+        gpu_model = linter.build_embedding_model("minilm")
+        st.SentenceTransformer.return_value = MagicMock()
+        st.SentenceTransformer.return_value.device.type = "cpu"
+        cpu_model = linter.build_embedding_model("minilm")
+
+    gpu_model.half.assert_called_once()
+    cpu_model.half.assert_not_called()
+
+
+def test_detect_outliers_filters_and_sorts_scores():
+    """Scores above the threshold come back most anomalous first; ties keep input order."""
+    hdbscan = MagicMock()
+    hdbscan.HDBSCAN.return_value.outlier_scores_ = np.array([0.05, 0.4, 0.9, 0.4, 0.1])
+    with patch.dict(sys.modules, {"hdbscan": hdbscan}):
+        result = linter.detect_outliers_hdbscan(np.zeros((5, 2)), threshold=0.1)
+
+    assert result == [(2, 0.9), (1, 0.4), (3, 0.4)]
+    assert all(type(i) is int and type(s) is float for i, s in result)
+
+
+def test_term_embeddings_are_reused_across_runs():
+    """Only unseen terms reach the model; a fully cached run never loads it."""
+    model = MagicMock()
+    model.encode.side_effect = lambda terms, **kw: np.array([[float(len(t)), 1.0] for t in terms])
+
+    with patch("wildcards_gen.core.linter.load_embedding_model", return_value=model) as load:
+        first = linter.get_term_embeddings("minilm", ["cat", "horse"])
+        second = linter.get_term_embeddings("minilm", ["horse", "cat", "zebra"])
+        assert model.encode.call_args[0][0] == ["zebra"]
+
+        load.reset_mock()
+        model.encode.reset_mock()
+        third = linter.get_term_embeddings("minilm", ["zebra", "cat"])
+        load.assert_not_called()
+
+        # Vectors are stored per model
+        linter.get_term_embeddings("mpnet", ["cat"])
+        model.encode.assert_called_once()
+
+    assert first.tolist() == [[3.0, 1.0], [5.0, 1.0]]
+    assert second.tolist() == [[5.0, 1.0], [3.0, 1.0], [5.0, 1.0]]
+    assert third.tolist() == [[5.0, 1.0], [3.0, 1.0]]
+
+
+def test_term_embeddings_batch_writes_and_serve_repeats_from_memory():
+    """A batch stores its new vectors in one write; repeat lookups skip the database."""
+    model = MagicMock()
+    model.encode.side_effect = lambda terms, **kw: np.array([[float(len(t)), 1.0] for t in terms])
+
+    with (
+        patch("wildcards_gen.core.linter.load_embedding_model", return_value=model),
+        patch.object(linter, "_store_term_vectors", wraps=linter._store_term_vectors) as store,
+    ):
+        with linter.batched_term_writes():
+            linter.get_term_embeddings("minilm", ["cat", "horse"])
+            linter.get_term_embeddings("minilm", ["horse", "zebra"])
+            store.assert_not_called()
+        store.assert_called_once()
+        assert [term for _, term, _ in store.call_args[0][0]] == ["cat", "horse", "zebra"]
+
+    with patch("wildcards_gen.core.linter.sqlite3.connect") as connect:
+        assert linter.get_term_embeddings("minilm", ["zebra", "cat"]).tolist() == [[5.0, 1.0], [3.0, 1.0]]
+        connect.assert_not_called()
+
+    # With the memory cache gone the stored rows are still found
+    linter._TERM_VECTORS.clear()
+    with patch("wildcards_gen.core.linter.load_embedding_model") as load:
+        assert linter.get_term_embeddings("minilm", ["horse"]).tolist() == [[5.0, 1.0]]
+        load.assert_not_called()
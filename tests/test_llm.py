@@ -0,0 +1,182 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from wildcards_gen.core import llm
+from wildcards_gen.core.llm import LLMEngine
+
+
+def _reply(content):
+    response = MagicMock()
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+
+def test_dynamic_structure_reuses_one_session():
+    engine = LLMEngine(api_key="key")
+    assert engine._session.headers["Authorization"] == "Bearer key"
+
+    with (
+        patch.object(engine, "_load_prompt", side_effect=["{topic}", "{roots}"]),
+        patch.object(engine._session, "post", side_effect=[_reply("roots"), _reply("tree:\n- leaf")]) as post,
+    ):
+        assert engine.generate_dynamic_structure("Topic") == "tree:\n- leaf"
+
+    assert post.call_count == 2
+
+
+def test_each_thread_gets_its_own_session():
+    """requests.Session is not thread-safe, so pool workers must not share one."""
+    engine = LLMEngine(api_key="key")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        worker_session = pool.submit(lambda: engine._session).result()
+
+    assert engine._session is engine._session
+    assert worker_session is not engine._session
+    assert worker_session.headers["Authorization"] == "Bearer key"
+
+
+def test_batch_workers_keep_their_sessions_across_calls():
+    """Workers outlive a call, so later batches reuse their pooled connections."""
+    engine = LLMEngine(api_key="key")
+    sessions = []
+    # Hold each call's three batches in flight together so each needs three workers
+    in_flight = threading.Barrier(3, timeout=5)
+
+    def fake_batch(prompt_template, terms, structure_yaml):
+        sessions.append(engine._session)
+        in_flight.wait()
+        return {"animal": terms}
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_categorize_batch", side_effect=fake_batch),
+    ):
+        engine.categorize_terms(["a", "b", "c"], "skeleton", batch_size=1)
+        engine.categorize_terms(["d", "e", "f"], "skeleton", batch_size=1)
+
+    # Six batches but never more sessions than the engine has workers
+    assert len(sessions) == 6
+    assert len({id(session) for session in sessions}) <= llm.CATEGORIZE_MAX_WORKERS
+
+
+def test_categorize_terms_batches_and_merges_in_order():
+    engine = LLMEngine(api_key="key")
+
+    def fake_call(messages, response_format=None):
+        terms = messages[0]["content"].split("|")[1].split(", ")
+        return json.dumps({"animal": {"dog": terms}})
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", side_effect=fake_call) as call,
+    ):
+        result = engine.categorize_terms(["a", "b", "c", "d", "e"], "skeleton", batch_size=2)
+
+    assert call.call_count == 3
+    assert result == {"animal": {"dog": ["a", "b", "c", "d", "e"]}}
+
+
+def test_categorize_terms_warns_about_failed_batches(caplog):
+    """Terms from a batch that failed are reported rather than silently dropped."""
+    engine = LLMEngine(api_key="key")
+
+    def fake_call(messages, response_format=None):
+        terms = messages[0]["content"].split("|")[1].split(", ")
+        return None if "c" in terms else json.dumps({"animal": terms})
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", side_effect=fake_call),
+    ):
+        result = engine.categorize_terms(["a", "b", "c", "d", "e"], "skeleton", batch_size=2)
+
+    assert result == {"animal": ["a", "b", "e"]}
+    assert "failed for 1 of 3 batches; 2 terms were not categorized" in caplog.text
+
+
+def test_categorize_terms_malformed_json_returns_none():
+    engine = LLMEngine(api_key="key")
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", return_value='{"animal": ['),
+    ):
+        assert engine.categorize_terms(["dog"], "skeleton") is None
+
+
+def test_categorize_terms_sends_each_term_once():
+    engine = LLMEngine(api_key="key")
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", return_value='{"animal": ["dog", "cat"]}') as call,
+    ):
+        engine.categorize_terms(["dog", "cat", "dog", "dog"], "skeleton")
+
+    assert call.call_args[0][0][0]["content"] == "skeleton|dog, cat"
+
+
+def test_categorize_terms_collapses_case_variants():
+    """Case variants such as Dog and dog are sent once and all land where the LLM put it."""
+    engine = LLMEngine(api_key="key")
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", return_value='{"animal": {"pet": ["Dog", "cat"]}}') as call,
+    ):
+        result = engine.categorize_terms(["Dog", "cat", "dog", "DOG", "Dog"], "skeleton")
+
+    assert call.call_args[0][0][0]["content"] == "skeleton|Dog, cat"
+    assert result == {"animal": {"pet": ["Dog", "dog", "DOG", "cat"]}}
+
+
+def test_categorize_terms_reuses_unchanged_batches():
+    engine = LLMEngine(api_key="key")
+
+    def fake_call(messages, response_format=None):
+        terms = messages[0]["content"].split("|")[1].split(", ")
+        return json.dumps({"animal": terms})
+
+    with (
+        patch.object(engine, "_load_prompt", return_value="{structure_with_instructions}|{terms}"),
+        patch.object(engine, "_call_api", side_effect=fake_call) as call,
+    ):
+        first = engine.categorize_terms(["a", "b", "c", "d"], "skeleton", batch_size=2)
+        # Only the second batch changed
+        second = engine.categorize_terms(["a", "b", "c", "e"], "skeleton", batch_size=2)
+
+    assert call.call_count == 3
+    assert first == {"animal": ["a", "b", "c", "d"]}
+    assert second == {"animal": ["a", "b", "c", "e"]}
+
+
+def test_enrich_instructions_splits_large_structures():
+    engine = LLMEngine(api_key="key")
+    structure = "animal: # instruction: creatures\n  dog:\n    - beagle\nvehicle:\n  - car\nplant:\n  - oak\n"
+
+    def fake_enrich(yaml_text, topic):
+        if yaml_text.startswith("plant"):
+            return None  # failed part is kept as-is
+        key = yaml_text.split(":", 1)[0]
+        return yaml_text.replace(f"{key}:\n", f"{key}: # instruction: enriched {key}\n", 1)
+
+    with patch.object(engine, "_enrich_chunk", side_effect=fake_enrich) as enrich:
+        result = engine.enrich_instructions(structure, chunk_chars=20)
+
+    assert enrich.call_count == 3
+    assert result == (
+        "animal: # instruction: creatures\n  dog:\n    - beagle\n"
+        "vehicle: # instruction: enriched vehicle\n  - car\n"
+        "plant:\n  - oak\n"
+    )
+
+
+def test_enrich_instructions_sends_small_structures_whole():
+    engine = LLMEngine(api_key="key")
+
+    with patch.object(engine, "_enrich_chunk", return_value="a: # instruction: x\n  - b\n") as enrich:
+        assert engine.enrich_instructions("a:\n  - b\n") == "a: # instruction: x\n  - b\n"
+
+    enrich.assert_called_once_with("a:\n  - b\n", "AI image generation wildcards")
@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from wildcards_gen.core.llm_cache import LLMResponseCache
+
+VECTORS = {
+    "dog breeds": np.array([1.0, 0.0], dtype=np.float32),
+    "breeds of dogs": np.array([0.96, 0.28], dtype=np.float32),
+    "spaceships": np.array([0.0, 1.0], dtype=np.float32),
+}
+
+
+def test_exact_hit_is_scoped_by_kind_and_model(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+    cache.put("enrich", "model-a", "a:\n- b\n", "enriched")
+
+    assert cache.get("enrich", "model-a", "a:\n- b\n") == "enriched"
+    assert cache.get("enrich", "model-b", "a:\n- b\n") is None
+    assert cache.get("categorize", "model-a", "a:\n- b\n") is None
+
+
+def test_semantic_hit_above_threshold(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), threshold=0.9)
+    with patch("wildcards_gen.core.llm_cache._encode", side_effect=VECTORS.get):
+        cache.put("create", "m", "dog breeds", "dogs: []", semantic=True)
+
+        assert cache.get("create", "m", "breeds of dogs", semantic=True) == "dogs: []"
+        assert cache.get("create", "m", "breeds of dogs") is None  # exact only
+        assert cache.get("create", "m", "spaceships", semantic=True) is None
+
+
+def test_semantic_lookup_without_encoder_is_exact(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+    with patch("wildcards_gen.core.llm_cache._encode", return_value=None):
+        cache.put("create", "m", "dog breeds", "dogs: []", semantic=True)
+        assert cache.get("create", "m", "dog breeds", semantic=True) == "dogs: []"
+        assert cache.get("create", "m", "breeds of dogs", semantic=True) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=2)
+    with patch("wildcards_gen.core.llm_cache.time") as clock:
+        clock.time.side_effect = [1.0, 2.0, 3.0, 4.0]
+        cache.put("enrich", "m", "first", "1")
+        cache.put("enrich", "m", "second", "2")
+        assert cache.get("enrich", "m", "first") == "1"  # refreshed, now newest
+        cache.put("enrich", "m", "third", "3")
+
+    assert cache.get("enrich", "m", "second") is None
+    assert cache.get("enrich", "m", "first") == "1"
+    assert cache.get("enrich", "m", "third") == "3"
+
+
+def test_create_handler_serves_cached_skeleton(tmp_path):
+    from wildcards_gen import gui
+
+    cache = MagicMock()
+    cache.get.return_value = "animals:\n- dog\n"
+    with (
+        patch("wildcards_gen.gui._response_cache", return_value=cache),
+        patch("wildcards_gen.gui._llm_engine") as engine,
+        patch("wildcards_gen.gui.save_and_preview", return_value=("path", "preview")) as save,
+    ):
+        assert gui.create_handler("Animals", "m", "key", "out.yaml") == ("path", "preview")
+
+    cache.get.assert_called_once_with("create", "m", "Animals", semantic=False)
+    engine.assert_not_called()
+    assert save.call_args[0][0] == {"animals": ["dog"]}
+
+
+def test_response_cache_is_off_by_default():
+    """Re-clicking Create or Enrich must produce a new generation unless caching is opted into."""
+    from wildcards_gen import gui
+    from wildcards_gen.core.config import Config
+
+    assert Config().llm_cache_enabled is False
+    assert Config().llm_cache_semantic is False
+    with patch.object(gui.config, "llm_cache_enabled", False):
+        assert gui._response_cache() is None
+
+
+def test_create_handler_matches_similar_topics_only_when_opted_in(monkeypatch):
+    from wildcards_gen import gui
+
+    cache = MagicMock()
+    cache.get.return_value = None
+    monkeypatch.setattr(gui.config, "llm_cache_semantic", True)
+    with (
+        patch("wildcards_gen.gui._response_cache", return_value=cache),
+        patch("wildcards_gen.gui._llm_engine") as engine,
+        patch("wildcards_gen.gui.save_and_preview", return_value=("path", "preview")),
+    ):
+        engine.return_value.generate_dynamic_structure.return_value = "animals:\n- dog\n"
+        gui.create_handler("Animals", "m", "key", "out.yaml")
+
+    cache.get.assert_called_once_with("create", "m", "Animals", semantic=True)
+    cache.put.assert_called_once_with("create", "m", "Animals", "animals:\n- dog\n", semantic=True)
+
+
+def test_topic_encoder_shares_the_linter_model():
+    from wildcards_gen.core import llm_cache
+
+    llm_cache._topic_encoder.cache_clear()
+    with patch("wildcards_gen.core.linter.load_embedding_model") as load:
+        assert llm_cache._topic_encoder() is load.return_value
+    load.assert_called_once_with(llm_cache.TOPIC_EMBEDDING_MODEL)
+    llm_cache._topic_encoder.cache_clear()
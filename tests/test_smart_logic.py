@@ -1,8 +1,11 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import numpy as np
 
 from wildcards_gen.core.smart import (
     SmartConfig,
+    apply_semantic_cleaning,
     should_prune_node,
 )
 
@@ -81,5 +84,26 @@ class TestSmartConfigMergeOrphans(unittest.TestCase):
         self.assertTrue(config.merge_orphans)
 
 
+class TestSemanticCleaning(unittest.TestCase):
+    @patch("wildcards_gen.core.linter.check_dependencies", return_value=True)
+    @patch("wildcards_gen.core.linter.detect_outliers_hdbscan", return_value=[(2, 0.9)])
+    @patch("wildcards_gen.core.linter.load_embedding_model")
+    def test_repeat_cleaning_reuses_term_vectors(self, mock_load, mock_detect, mock_deps):
+        """Re-running with a new threshold removes outliers without re-encoding."""
+        model = mock_load.return_value
+        model.encode.side_effect = lambda terms, **kw: np.ones((len(terms), 4))
+        items = ["beagle", "pug", "toaster"]
+
+        first = apply_semantic_cleaning(items, SmartConfig(enabled=True, semantic_cleanup=True))
+        second = apply_semantic_cleaning(
+            items, SmartConfig(enabled=True, semantic_cleanup=True, semantic_threshold=0.2)
+        )
+
+        self.assertEqual(first, ["beagle", "pug"])
+        self.assertEqual(second, ["beagle", "pug"])
+        model.encode.assert_called_once()
+        self.assertEqual(mock_detect.call_args_list[1].args[1], 0.2)
+
+
 if __name__ == "__main__":
     unittest.main()
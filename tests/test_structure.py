@@ -1,8 +1,12 @@
 import os
 import shutil
 import unittest
+from unittest.mock import patch
 
-from wildcards_gen.core.structure import StructureManager
+from ruamel.yaml.comments import CommentedMap
+from ruamel.yaml.emitter import RoundTripEmitter
+
+from wildcards_gen.core.structure import StructureManager, add_eol_comment, generated_map
 
 
 class TestStructureManager(unittest.TestCase):
@@ -39,6 +43,41 @@ class TestStructureManager(unittest.TestCase):
         self.assertIn("# instruction: edible plants", yaml_str)
         self.assertIn("- apple", yaml_str)
 
+    def test_add_eol_comment_matches_ruamel(self):
+        expected, actual = CommentedMap(), generated_map()
+        with patch.object(CommentedMap, "yaml_add_eol_comment", autospec=True) as slow_path:
+            for key in ["birds", "cats", "dogs"]:
+                actual[key] = [key]
+                add_eol_comment(actual, key, f"# instruction: {key}")
+        slow_path.assert_not_called()
+        for key in ["birds", "cats", "dogs"]:
+            expected[key] = [key]
+            expected.yaml_add_eol_comment(f"# instruction: {key}", key)
+
+        self.assertEqual(self.sm.to_string(actual), self.sm.to_string(expected))
+
+    def test_add_eol_comment_on_loaded_map_without_comments(self):
+        source = "animals:\n  - dog\nplants:\n  - fern\n"
+        expected, actual = self.sm.from_string(source), self.sm.from_string(source)
+        expected.yaml_add_eol_comment("# instruction: green things", "plants")
+        add_eol_comment(actual, "plants", "# instruction: green things")
+
+        self.assertEqual(self.sm.to_string(actual), self.sm.to_string(expected))
+
+    def test_add_eol_comment_aligns_with_loaded_comments(self):
+        source = (
+            "animals:    # instruction: living things\n  - dog\nplants:     # instruction: green things\n  - fern\n"
+        )
+        expected, actual = self.sm.from_string(source), self.sm.from_string(source)
+        for node in (expected, actual):
+            node["rocks"] = ["granite"]
+        expected.yaml_add_eol_comment("# instruction: stones", "rocks")
+        add_eol_comment(actual, "rocks", "# instruction: stones")
+
+        yaml_str = self.sm.to_string(actual)
+        self.assertEqual(yaml_str, self.sm.to_string(expected))
+        self.assertIn("rocks:      # instruction: stones", yaml_str)
+
     def test_save_and_load(self):
         root = self.sm.create_empty_structure()
         self.sm.add_category_with_instruction(root, "VEHICLES", "machines for transport")
@@ -56,6 +95,32 @@ class TestStructureManager(unittest.TestCase):
             self.assertIn("# instruction: machines for transport", content)
             self.assertIn("# instruction: 4 wheels", content)
 
+    def test_load_missing_file_returns_empty(self):
+        loaded = self.sm.load_structure(os.path.join(self.test_dir, "does_not_exist.yaml"))
+        self.assertEqual(len(loaded), 0)
+
+    def test_save_recreates_removed_directory(self):
+        root = self.sm.create_empty_structure()
+        self.sm.add_leaf_list(root, "FRUITS", ["apple"])
+        self.sm.save_structure(root, self.test_file)
+
+        # The directory is cached as created; removing it must not break later saves
+        shutil.rmtree(self.test_dir)
+        self.sm.save_structure(root, self.test_file)
+        self.assertTrue(os.path.exists(self.test_file))
+
+    def test_failed_save_keeps_previous_file(self):
+        root = self.sm.create_empty_structure()
+        self.sm.add_leaf_list(root, "FRUITS", ["apple"])
+        self.sm.save_structure(root, self.test_file)
+
+        # An unrepresentable value makes the dump fail partway through
+        self.sm.save_structure({"FRUITS": [object()]}, self.test_file)
+
+        self.assertEqual(os.listdir(self.test_dir), ["test_structure.yaml"])
+        with open(self.test_file, "r") as f:
+            self.assertIn("- apple", f.read())
+
     def test_round_trip_persistence(self):
         root = self.sm.create_empty_structure()
         self.sm.add_category_with_instruction(root, "PLANTS", "green things")
@@ -77,6 +142,16 @@ class TestStructureManager(unittest.TestCase):
             self.assertIn("# instruction: green things", content)
             self.assertIn("# instruction: tall plants", content)
 
+    def test_repeated_scalars_match_stock_emitter(self):
+        # Scalar analysis is reused across occurrences; quoting must not leak between them
+        text = "a:\n  - 'yes'\n  - plain\n  - 'yes'\nb:\n  - plain\n  - 'a: b'\n  - ''\n  - ''\n"
+        data = self.sm.from_string(text)
+        data["c"] = ["yes", "a: b", "", "plain", "multi\nline"]
+
+        stock = StructureManager()
+        stock.yaml.Emitter = RoundTripEmitter
+        self.assertEqual(self.sm.to_string(data), stock.to_string(data))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,10 +3,11 @@ import os
 import shutil
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from ruamel.yaml.comments import CommentedMap
 
-from wildcards_gen.core.structure import StructureManager
+from wildcards_gen.core.structure import StructureManager, add_eol_comment
 
 
 class TestStructureExtended(unittest.TestCase):
@@ -50,6 +51,42 @@ class TestStructureExtended(unittest.TestCase):
         self.assertEqual(car["label"], "vehicle")
         self.assertEqual(car["hierarchy"], ["vehicle"])
 
+    def test_merge_categorized_data(self):
+        structure = CommentedMap()
+        structure["animal"] = CommentedMap()
+        structure["animal"]["dog"] = ["beagle"]
+        structure["vehicle"] = ["car"]
+
+        incoming = {
+            "animal": {"dog": ["beagle", "poodle", "poodle"], "cat": ["siamese"]},
+            "vehicle": {"boat": ["canoe"]},
+        }
+        self.mgr.merge_categorized_data(structure, incoming)
+
+        self.assertEqual(structure["animal"]["dog"], ["beagle", "poodle"])
+        self.assertEqual(structure["animal"]["cat"], ["siamese"])
+        # Type conflict: existing list is kept as-is
+        self.assertEqual(structure["vehicle"], ["car"])
+
+    def test_merged_nodes_accept_comments(self):
+        structure = CommentedMap()
+        self.mgr.merge_categorized_data(structure, {"plant": {"tree": ["oak"]}})
+
+        add_eol_comment(structure, "plant", "instruction: green things")
+        add_eol_comment(structure["plant"], "tree", "instruction: woody")
+
+        yaml_str = self.mgr.to_string(structure)
+        self.assertIn("plant:  # instruction: green things", yaml_str)
+        self.assertIn("tree:  # instruction: woody", yaml_str)
+
+    def test_json_round_trip(self):
+        data = self.mgr.from_string("animal:\n  dog: [beagle, pug]\nweight: 1.5\n2020: [café]\n")
+        expected = {"animal": {"dog": ["beagle", "pug"]}, "weight": 1.5, "2020": ["café"]}
+
+        self.assertEqual(self.mgr.from_json(self.mgr.to_json(data)), expected)
+        with patch("wildcards_gen.core.structure.orjson", None):
+            self.assertEqual(self.mgr.from_json(self.mgr.to_json(data)), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
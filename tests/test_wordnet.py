@@ -0,0 +1,22 @@
+from wildcards_gen.core.wordnet import get_all_descendants, get_synset_name, get_synset_wnid, is_abstract_category
+
+
+def test_get_all_descendants_filters_by_wnid(sample_hierarchy):
+    dog = sample_hierarchy["lookup"]["dog.n.01"]
+    beagle = sample_hierarchy["lookup"]["beagle.n.01"]
+
+    assert get_all_descendants(dog) == ["beagle", "poodle", "pug"]
+    assert get_all_descendants(dog, valid_wnids={get_synset_wnid(beagle), "n99999999"}) == ["beagle"]
+
+
+def test_is_abstract_category(mock_synset_factory):
+    assert is_abstract_category(mock_synset_factory("entity.n.01", ["entity"]))
+    assert not is_abstract_category(mock_synset_factory("dog.n.01", ["dog"]))
+
+
+def test_get_synset_name_interns_repeated_names(mock_synset_factory):
+    first = mock_synset_factory("bass.n.01", ["sea_bass"])
+    second = mock_synset_factory("bass.n.02", ["sea_" + "bass"])
+
+    assert get_synset_name(first) == "sea bass"
+    assert get_synset_name(first) is get_synset_name(second)
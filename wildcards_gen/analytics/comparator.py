@@ -51,8 +51,9 @@ class TaxonomyComparator:
         """
         Compare two YAML files and return stability metrics.
         """
-        struct1 = self.mgr.load_structure(file1)
-        struct2 = self.mgr.load_structure(file2)
+        # Read-only: comments are irrelevant to stability metrics
+        struct1 = self.mgr.load_structure(file1, preserve_comments=False)
+        struct2 = self.mgr.load_structure(file2, preserve_comments=False)
 
         if not struct1 or not struct2:
             raise ValueError("One or both input files could not be loaded or are empty.")
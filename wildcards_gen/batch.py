@@ -154,7 +154,8 @@ class BatchProcessor:
                 job_obj = next((j for j in self.jobs if j.name == res["name"]), None)
                 if job_obj and os.path.exists(job_obj.output_path):
                     try:
-                        data = mgr.load_structure(job_obj.output_path)
+                        # Counting only: skip the round-trip loader's comment bookkeeping
+                        data = mgr.load_structure(job_obj.output_path, preserve_comments=False)
                         nodes = count_nodes(data)
                         leaves = len(mgr.extract_terms(data))
                     except Exception:
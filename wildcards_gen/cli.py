@@ -12,25 +12,25 @@ import argparse
 import logging
 import os
 import sys
-from typing import Any, Optional, cast
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 import yaml
 
-from .core.builder import HierarchyBuilder
 from .core.config import config
-from .core.datasets.coco import generate_coco_hierarchy
-from .core.datasets.imagenet import generate_imagenet_tree
-from .core.datasets.openimages import generate_openimages_hierarchy
-from .core.datasets.tencent import generate_tencent_hierarchy
 from .core.presets import (
     DATASET_CATEGORY_OVERRIDES,
     DATASET_PRESET_OVERRIDES,
     SMART_PRESETS,
 )
-from .core.smart import SmartConfig
 from .core.stats import StatsCollector
 from .core.structure import StructureManager
 
+# Builder, smart and dataset modules pull in NLTK (and scipy through it), which
+# costs over a second. They are imported inside the dataset commands so that
+# --help and the LLM, lint, compare and gui commands start without them.
+if TYPE_CHECKING:
+    from .core.smart import SmartConfig
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -125,8 +125,10 @@ def load_smart_overrides(config_path: Optional[str]) -> dict:
         return {}
 
 
-def get_smart_config(args, dataset_name: Optional[str] = None) -> SmartConfig:
+def get_smart_config(args, dataset_name: Optional[str] = None) -> "SmartConfig":
     """Helper to build SmartConfig from CLI args."""
+    from .core.smart import SmartConfig
+
     apply_smart_preset(args)
     overrides = load_smart_overrides(args.smart_config)
 
@@ -158,6 +160,10 @@ def get_smart_config(args, dataset_name: Optional[str] = None) -> SmartConfig:
 
 def cmd_dataset_imagenet(args):
     """Handle imagenet subcommand."""
+    from .core.builder import HierarchyBuilder
+    from .core.datasets.imagenet import generate_imagenet_tree
+    from .core.smart import SmartConfig
+
     # Analysis mode override
     if getattr(args, "analyze", False):
         print("🔍 Analyzing ImageNet hierarchy... (this may take a moment)")
@@ -240,6 +246,8 @@ def cmd_dataset_imagenet(args):
 
 def cmd_dataset_coco(args):
     """Handle coco subcommand."""
+    from .core.datasets.coco import generate_coco_hierarchy
+
     hierarchy = generate_coco_hierarchy(with_glosses=not args.no_glosses, max_depth=args.depth)
 
     mgr = StructureManager()
@@ -249,6 +257,10 @@ def cmd_dataset_coco(args):
 
 def cmd_dataset_openimages(args):
     """Handle openimages subcommand."""
+    from .core.builder import HierarchyBuilder
+    from .core.datasets.openimages import generate_openimages_hierarchy
+    from .core.smart import SmartConfig
+
     # Analysis mode override
     if getattr(args, "analyze", False):
         print("🔍 Analyzing Open Images hierarchy...")
@@ -314,6 +326,10 @@ def cmd_dataset_openimages(args):
 
 def cmd_dataset_tencent(args):
     """Handle tencent subcommand."""
+    from .core.builder import HierarchyBuilder
+    from .core.datasets.tencent import generate_tencent_hierarchy
+    from .core.smart import SmartConfig
+
     # Analysis mode override
     if getattr(args, "analyze", False):
         print("🔍 Analyzing Tencent ML-Images hierarchy...")
@@ -385,7 +401,7 @@ def cmd_categorize(args):
 
     # Load terms
     with open(args.input, "r", encoding="utf-8") as f:
-        terms = [line.strip() for line in f if line.strip()]
+        terms = [term for line in f if (term := line.strip())]
 
     logger.info(f"Loaded {len(terms)} terms from {args.input}")
 
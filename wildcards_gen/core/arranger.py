@@ -161,23 +161,29 @@ def get_lca_name(terms: List[str]) -> Optional[str]:
 # ... imports ...
 
 
-def get_medoid_name(cluster_embeddings: np.ndarray, cluster_terms: List[str]) -> Optional[str]:
+def _find_medoid(cluster_embeddings: np.ndarray, cluster_terms: List[str]) -> str:
+    """Return the term closest to the cluster centroid."""
+    centroid = np.mean(cluster_embeddings, axis=0)
+    distances = euclidean_distances([centroid], cluster_embeddings)
+    return cluster_terms[int(np.argmin(distances))]
+
+
+def get_medoid_name(
+    cluster_embeddings: np.ndarray, cluster_terms: List[str], medoid_term: Optional[str] = None
+) -> Optional[str]:
     """
     Finds the medoid (term closest to centroid) and asks WordNet for its hypernym.
+
+    Pass medoid_term when the caller has already found it.
     """
     if not cluster_terms:
         return None
 
     try:
-        # 1. Compute Centroid
-        centroid = np.mean(cluster_embeddings, axis=0)
-
-        # 2. Find Medoid (closest term to centroid)
-        distances = euclidean_distances([centroid], cluster_embeddings)
-        medoid_idx = np.argmin(distances)
-        medoid_term = cluster_terms[medoid_idx]
+        if medoid_term is None:
+            medoid_term = _find_medoid(cluster_embeddings, cluster_terms)
 
-        # 3. Get WordNet Hypernym of the medoid
+        # Get WordNet Hypernym of the medoid
         synset = get_primary_synset(medoid_term)
         if synset:
             hypernyms = synset.hypernyms()
@@ -205,20 +211,16 @@ def _generate_descriptive_name(
     """
     metadata = {"wnid": None, "source": "fallback", "examples": cluster_terms[:3]}
 
-    # Pre-calculate medoid hypernym and term
-    medoid_hypernym = get_medoid_name(cluster_embeddings, cluster_terms)
-
-    # Find the actual medoid term for validation/examples
+    # Find the medoid once; it feeds both the hypernym lookup and LCA validation
     medoid_term = None
     try:
-        centroid = np.mean(cluster_embeddings, axis=0)
-        distances = euclidean_distances([centroid], cluster_embeddings)
-        medoid_idx = np.argmin(distances)
-        medoid_term = cluster_terms[medoid_idx]
+        medoid_term = _find_medoid(cluster_embeddings, cluster_terms)
         metadata["medoid_term"] = medoid_term
     except Exception:
         pass
 
+    medoid_hypernym = get_medoid_name(cluster_embeddings, cluster_terms, medoid_term=medoid_term)
+
     name = "Group"
 
     # Decision Logic
@@ -367,6 +369,20 @@ def _hash_array(arr: np.ndarray) -> str:
     return hashlib.sha256(arr.tobytes()).hexdigest()
 
 
+def _gpu_umap() -> Optional[Any]:
+    """Return cuML's GPU UMAP class when RAPIDS is installed and usable, else None."""
+    try:
+        from cuml.manifold import UMAP
+
+        return UMAP
+    except ImportError:
+        return None
+    except Exception as e:
+        # cuML is installed but cannot initialise, e.g. no CUDA device
+        logger.debug(f"cuML unavailable, using umap-learn: {e}")
+        return None
+
+
 def compute_umap_embeddings(
     embeddings: np.ndarray,
     n_components: int = 5,
@@ -375,10 +391,13 @@ def compute_umap_embeddings(
 ) -> np.ndarray:
     """
     Reduce embedding dimensionality using UMAP for better density-based clustering.
+    Runs on the GPU through cuML when available, otherwise through umap-learn.
     Falls back to original embeddings if UMAP is missing or fails.
     """
     try:
-        import umap
+        gpu_umap = _gpu_umap()
+        if gpu_umap is None:
+            import umap
 
         # UMAP needs enough neighbors. Default is 15.
         n_samples = embeddings.shape[0]
@@ -394,15 +413,18 @@ def compute_umap_embeddings(
             return _UMAP_CACHE[cache_key]
 
         # 5 components is a sweet spot for HDBSCAN (dense but not too high-dim)
-        reducer = umap.UMAP(
-            n_neighbors=n_neighbors,
-            n_components=n_components,
-            min_dist=min_dist,
-            metric="cosine",
-            random_state=42,  # Try to keep it somewhat deterministic
-            n_jobs=1,
-        )
-        result = reducer.fit_transform(embeddings)
+        params: Dict[str, Any] = {
+            "n_neighbors": n_neighbors,
+            "n_components": n_components,
+            "min_dist": min_dist,
+            "metric": "cosine",
+            "random_state": 42,  # Try to keep it somewhat deterministic
+        }
+        if gpu_umap is not None:
+            reducer = gpu_umap(**params, output_type="numpy")
+        else:
+            reducer = umap.UMAP(**params, n_jobs=1)
+        result = np.asarray(reducer.fit_transform(embeddings))
 
         # Update Cache (LRU-style eviction not strictly implemented, just simple cap)
         if len(_UMAP_CACHE) >= _UMAP_CACHE_MAX_SIZE:
@@ -18,8 +18,10 @@ from .smart import (
     TraversalBudget,
     apply_semantic_arrangement,
     apply_semantic_cleaning,
+    semantic_cleaning_pass,
     should_prune_node,
 )
+from .structure import add_eol_comment, generated_map
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +49,8 @@ class HierarchyBuilder:
         logger.info(f"Building hierarchy for '{root.name}'...")
 
         # 1. Prune and Arrange
-        processed_node, orphans = self._prune_and_collect(root)
+        with semantic_cleaning_pass():
+            processed_node, orphans = self._prune_and_collect(root)
 
         # If the root itself was pruned and became orphans
         if not processed_node and orphans:
@@ -219,7 +222,7 @@ class HierarchyBuilder:
             items = sorted(node.items, key=str.casefold)
             return CommentedSeq(items) if items else []
 
-        res = CommentedMap()
+        res = generated_map()
         for child in node.children:
             child_val = self._to_commented_map(child)
             res[child.name] = child_val
@@ -228,10 +231,7 @@ class HierarchyBuilder:
             instruction = child.metadata.get("instruction")
             if instruction:
                 try:
-                    res.yaml_add_eol_comment(
-                        config.instruction_template.format(gloss=instruction),
-                        child.name,
-                    )
+                    add_eol_comment(res, child.name, config.instruction_template.format(gloss=instruction))
                 except Exception:
                     pass
 
@@ -33,6 +33,17 @@ class Config:
     gui_port: int = 7862
     skip_nodes: Optional[List[str]] = field(default_factory=list)
 
+    # LLM response cache (stored in db_path). Off by default: users re-click
+    # Create/Enrich to get a different generation, which a cache would prevent.
+    llm_cache_enabled: bool = False
+    # Let Create reuse the skeleton of a similar, not identical, topic
+    llm_cache_semantic: bool = False
+    # Cosine similarity above which a new topic reuses a cached skeleton
+    llm_cache_threshold: float = 0.87
+
+    # Run embedding models in FP16 when they load onto a CUDA device
+    embedding_half_precision: bool = True
+
     # ...
     _config: Dict[str, Any] = field(default_factory=dict)
 
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, cast
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
 from ..config import config
+from ..structure import add_eol_comment, generated_map
 from ..wordnet import ensure_nltk_data, get_primary_synset, get_synset_gloss
 from .downloaders import ensure_coco_data
 
@@ -54,7 +55,7 @@ def generate_coco_hierarchy(with_glosses: bool = True, max_depth: int = 10) -> C
     logger.info("Generating COCO hierarchy...")
     categories = load_coco_categories()
 
-    result = CommentedMap()
+    result = generated_map()
 
     # Group by supercategory
     grouped: Dict[str, List[str]] = {}
@@ -76,7 +77,7 @@ def generate_coco_hierarchy(with_glosses: bool = True, max_depth: int = 10) -> C
 
         if instruction:
             try:
-                result.yaml_add_eol_comment(config.instruction_template.format(gloss=instruction), supercat)
+                add_eol_comment(result, supercat, config.instruction_template.format(gloss=instruction))
             except Exception:
                 pass
 
@@ -20,7 +20,9 @@ from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
 from ..builder import TaxonomyNode
 from ..config import config
+from ..progress import ProgressCallback
 from ..smart import TraversalBudget
+from ..structure import add_eol_comment, generated_map
 from ..wordnet import (
     ensure_nltk_data,
     get_all_descendants,
@@ -193,6 +195,7 @@ def generate_imagenet_tree(
     exclude_regex: Optional[List[str]] = None,
     exclude_subtree: Optional[List[str]] = None,
     preview_limit: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
     **kwargs,  # Accept and ignore smart args for now
 ) -> Optional[TaxonomyNode]:
     """
@@ -234,7 +237,7 @@ def generate_imagenet_tree(
 
     logger.info(f"Extracting raw hierarchy from {root_synset_str} (max_depth={max_depth})")
 
-    budget = TraversalBudget(preview_limit)
+    budget = TraversalBudget(preview_limit, progress_callback=progress_callback)
 
     return build_taxonomy_tree(
         root_synset,
@@ -305,7 +308,7 @@ def generate_imagenet_from_wnids(
 
     # Convert to CommentedMap with glosses
     def convert_tree(tree: dict, depth: int) -> CommentedMap:
-        result = CommentedMap()
+        result = generated_map()
 
         for key, value in tree.items():
             if depth >= max_depth or not value:
@@ -323,9 +326,10 @@ def generate_imagenet_from_wnids(
                 synset = get_primary_synset(key)
                 if synset:
                     try:
-                        result.yaml_add_eol_comment(
-                            config.instruction_template.format(gloss=get_synset_gloss(synset)),
+                        add_eol_comment(
+                            result,
                             key,
+                            config.instruction_template.format(gloss=get_synset_gloss(synset)),
                         )
                     except Exception:
                         pass
@@ -12,6 +12,7 @@ import logging
 from typing import Any, Dict, Optional, Tuple
 
 from ..builder import TaxonomyNode
+from ..progress import ProgressCallback
 from ..smart import TraversalBudget
 from ..wordnet import (
     ensure_nltk_data,
@@ -257,15 +258,16 @@ def generate_openimages_hierarchy(
     with_glosses: bool = True,
     bbox_only: bool = False,
     preview_limit: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
     **kwargs,  # Accept and ignore smart args
 ) -> Optional[TaxonomyNode]:
     """
     Generate Open Images TaxonomyNode tree.
     """
     ensure_nltk_data()
-    hierarchy, id_to_name = load_openimages_data()
+    hierarchy, id_to_name = load_openimages_data(progress_callback=progress_callback)
 
-    budget = TraversalBudget(preview_limit)
+    budget = TraversalBudget(preview_limit, progress_callback=progress_callback)
 
     if bbox_only:
         logger.info("Extracting Open Images (BBox mode)")
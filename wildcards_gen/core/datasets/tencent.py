@@ -5,6 +5,7 @@ from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 
 from ..builder import TaxonomyNode
+from ..progress import ProgressCallback
 from ..smart import TraversalBudget
 from ..wordnet import ensure_nltk_data, get_synset_from_wnid, get_synset_gloss
 from .downloaders import download_tencent_hierarchy
@@ -122,6 +123,7 @@ def generate_tencent_hierarchy(
     max_depth: int = 4,
     with_glosses: bool = True,
     preview_limit: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
     **kwargs,  # Accept and ignore smart args
 ) -> Optional[TaxonomyNode]:
     """
@@ -137,7 +139,7 @@ def generate_tencent_hierarchy(
     # Sort roots by name for stability
     sorted_roots = sorted(roots, key=lambda idx: categories[idx]["name"].split(",")[0].strip().casefold())
 
-    budget = TraversalBudget(preview_limit)
+    budget = TraversalBudget(preview_limit, progress_callback=progress_callback, total=len(categories))
 
     for root_idx in sorted_roots:
         node = build_taxonomy_tree(
@@ -5,11 +5,17 @@ Uses embedding models (Qwen3, MPNet, MiniLM) and HDBSCAN* to detect
 semantic outliers in wildcard lists.
 """
 
+import contextlib
 import logging
-from typing import Any, Dict, List, Tuple, cast
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
 
 import numpy as np
 
+from .config import config
+
 logger = logging.getLogger(__name__)
 
 # Model registry
@@ -34,9 +40,19 @@ def check_dependencies():
 import functools
 
 
-@functools.lru_cache(maxsize=1)
+# One slot per registry entry: lint, smart pruning, the arranger and the LLM
+# cache's topic matcher may each use a different model, and alternating between
+# them should not reload. Every model used stays resident: in FP32 roughly
+# 2.4 GB for qwen3, 440 MB for mpnet and 130 MB for minilm, about half that in
+# FP16 on GPU. Call load_embedding_model.cache_clear() to release them.
+@functools.lru_cache(maxsize=len(MODELS))
 def load_embedding_model(model_name: str = "qwen3"):
-    """Load embedding model by short name."""
+    """Load embedding model by short name, cached per name."""
+    return build_embedding_model(model_name)
+
+
+def build_embedding_model(model_name: str = "qwen3"):
+    """Instantiate an embedding model by short name, without caching."""
     from sentence_transformers import SentenceTransformer
 
     model_id = MODELS.get(model_name, MODELS["qwen3"])
@@ -44,10 +60,18 @@ def load_embedding_model(model_name: str = "qwen3"):
 
     try:
         # Try finding it locally first to avoid "unauthenticated request" warnings
-        return SentenceTransformer(model_id, trust_remote_code=True, local_files_only=True)
+        model = SentenceTransformer(model_id, trust_remote_code=True, local_files_only=True)
     except Exception:
         # Fallback to downloading
-        return SentenceTransformer(model_id, trust_remote_code=True)
+        model = SentenceTransformer(model_id, trust_remote_code=True)
+
+    # Half precision halves weight traffic on GPU; outlier scores only compare
+    # relative distances, so the precision loss does not change the results.
+    # CPU kernels gain little from FP16, so models there stay in FP32.
+    if config.embedding_half_precision and model.device.type == "cuda":
+        logger.info(f"Using FP16 for {model_id}")
+        model.half()
+    return model
 
 
 def compute_list_embeddings(model, terms: List[str]):
@@ -57,6 +81,143 @@ def compute_list_embeddings(model, terms: List[str]):
     return model.encode(terms, show_progress_bar=False)
 
 
+# Terms per SELECT ... IN (...); stays under SQLite's host parameter limit
+_TERM_QUERY_CHUNK = 900
+
+# Term vectors kept in memory in front of the database. Smart cleaning asks for
+# one leaf list at a time and the same terms recur across lists and reruns.
+TERM_VECTOR_CACHE_SIZE = 50_000
+_TERM_VECTORS: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+_TERM_VECTORS_LOCK = threading.Lock()
+
+# Rows waiting for the end of a batched_term_writes() block on this thread
+_term_writes = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _term_table_ready(db_path: str) -> bool:
+    """Create the term_embeddings table, once per database per process."""
+    with sqlite3.connect(db_path, timeout=10) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS term_embeddings (
+                model TEXT NOT NULL,
+                term TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, term)
+            )
+        """)
+    return True
+
+
+@contextlib.contextmanager
+def _term_connection() -> Iterator[sqlite3.Connection]:
+    """Connect to the embeddings database, reusing the open batch's connection."""
+    conn = getattr(_term_writes, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+    _term_table_ready(config.db_path)
+    conn = sqlite3.connect(config.db_path, timeout=10)
+    if getattr(_term_writes, "pending", None) is not None:
+        _term_writes.conn = conn
+        yield conn
+        return
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _store_term_vectors(rows: List[Tuple[str, str, bytes]]) -> None:
+    """Write (model, term, vector) rows in a single transaction."""
+    if not rows:
+        return
+    try:
+        with _term_connection() as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO term_embeddings (model, term, vector) VALUES (?, ?, ?)", rows)
+    except sqlite3.Error as e:
+        logger.warning(f"Term embedding cache write failed: {e}")
+
+
+@contextlib.contextmanager
+def batched_term_writes() -> Iterator[None]:
+    """
+    Hold vectors encoded on this thread until the block exits, then store them
+    in one transaction instead of one per get_term_embeddings call. Lookups in
+    the block share one connection. Nested blocks join the outermost one.
+    """
+    if getattr(_term_writes, "pending", None) is not None:
+        yield
+        return
+    _term_writes.pending = []
+    try:
+        yield
+    finally:
+        pending, _term_writes.pending = _term_writes.pending, None
+        try:
+            _store_term_vectors(pending)
+        finally:
+            conn, _term_writes.conn = getattr(_term_writes, "conn", None), None
+            if conn is not None:
+                conn.close()
+
+
+def get_term_embeddings(model_name: str, terms: List[str]) -> np.ndarray:
+    """
+    Encode terms, reusing per-term vectors held in memory or stored in the
+    embeddings database.
+
+    Common terms recur across files, so only terms not yet seen with this
+    model are encoded, and the model is not loaded at all when every term is
+    cached. Rows of the result follow the order of terms.
+    """
+    model_id = MODELS.get(model_name, MODELS["qwen3"])
+    vectors: Dict[str, np.ndarray] = {}
+    with _TERM_VECTORS_LOCK:
+        for term in terms:
+            vec = _TERM_VECTORS.get((model_id, term))
+            if vec is not None:
+                _TERM_VECTORS.move_to_end((model_id, term))
+                vectors[term] = vec
+
+    unseen = [term for term in dict.fromkeys(terms) if term not in vectors]
+    if not unseen:
+        return np.stack([vectors[term] for term in terms])
+
+    try:
+        with _term_connection() as conn:
+            for start in range(0, len(unseen), _TERM_QUERY_CHUNK):
+                chunk = unseen[start : start + _TERM_QUERY_CHUNK]
+                rows = conn.execute(
+                    f"SELECT term, vector FROM term_embeddings WHERE model = ? AND term IN ({','.join('?' * len(chunk))})",
+                    (model_id, *chunk),
+                )
+                vectors.update((term, np.frombuffer(blob, dtype=np.float32)) for term, blob in rows)
+    except sqlite3.Error as e:
+        logger.debug(f"Term embedding cache read failed: {e}")
+
+    misses = [term for term in unseen if term not in vectors]
+    if misses:
+        logger.info(f"Encoding {len(misses)} of {len(terms)} terms ({len(terms) - len(misses)} cached)")
+        model = load_embedding_model(model_name)
+        fresh = np.asarray(compute_list_embeddings(model, misses), dtype=np.float32)
+        vectors.update(zip(misses, fresh, strict=True))
+        new_rows = [(model_id, term, vec.tobytes()) for term, vec in zip(misses, fresh, strict=True)]
+        pending: Optional[List[Tuple[str, str, bytes]]] = getattr(_term_writes, "pending", None)
+        if pending is None:
+            _store_term_vectors(new_rows)
+        else:
+            pending.extend(new_rows)
+
+    with _TERM_VECTORS_LOCK:
+        for term in unseen:
+            _TERM_VECTORS[(model_id, term)] = vectors[term]
+        while len(_TERM_VECTORS) > TERM_VECTOR_CACHE_SIZE:
+            _TERM_VECTORS.popitem(last=False)
+
+    return np.stack([vectors[term] for term in terms])
+
+
 def get_hdbscan_clusters(embeddings: np.ndarray, min_cluster_size: int = 2) -> Tuple[np.ndarray, np.ndarray]:
     """
     Run HDBSCAN on embeddings.
@@ -96,13 +257,12 @@ def detect_outliers_hdbscan(embeddings: np.ndarray, threshold: float = 0.1) -> L
         clusterer.fit(embeddings)
 
         # outlier_scores_ returns values where higher is more anomalous
-        scores = clusterer.outlier_scores_
+        scores = np.asarray(clusterer.outlier_scores_, dtype=np.float64)
 
-        # Filter by threshold
-        outliers = [(i, float(s)) for i, s in enumerate(scores) if s > threshold]
-
-        # Sort by score descending (most anomalous first)
-        return sorted(outliers, key=lambda x: -x[1])
+        # Filter by threshold, then sort by score descending (most anomalous first)
+        idx = np.flatnonzero(scores > threshold)
+        idx = idx[np.argsort(-scores[idx], kind="stable")]
+        return [(int(i), float(scores[i])) for i in idx]
     except Exception as e:
         logger.warning(f"HDBSCAN failed: {e}")
         return []
@@ -124,9 +284,6 @@ def lint_file(file_path: str, model_name: str, threshold: float) -> Tuple[Dict[s
     if not structure:
         raise ValueError(f"Could not load structure from {file_path}")
 
-    # Initialize model
-    model = load_embedding_model(model_name)
-
     report: Dict[str, Any] = {
         "file": file_path,
         "model": MODELS.get(model_name, model_name),
@@ -134,7 +291,9 @@ def lint_file(file_path: str, model_name: str, threshold: float) -> Tuple[Dict[s
         "issues": [],
     }
 
-    # Traverse and check leaf lists
+    # Collect leaf lists first so every term is encoded in a single batched call
+    leaves: List[Tuple[List[str], Any]] = []
+
     def traverse(node, path):
         if isinstance(node, dict):
             for k, v in node.items():
@@ -143,17 +302,26 @@ def lint_file(file_path: str, model_name: str, threshold: float) -> Tuple[Dict[s
             # It's a leaf list
             if len(node) < 3:
                 return  # Too small to check
+            leaves.append((path, node))
 
-            embeddings = compute_list_embeddings(model, node)
-            outliers = detect_outliers_hdbscan(embeddings, threshold)
+    traverse(structure, [])
 
-            if outliers:
-                issue: Dict[str, Any] = {"path": "/".join(path), "outliers": []}
-                for idx, score in outliers:
-                    cast(List[Dict[str, Any]], issue["outliers"]).append({"term": node[idx], "score": round(score, 3)})
-                cast(List[Any], report["issues"]).append(issue)
+    unique_terms = list(dict.fromkeys(str(term) for _, node in leaves for term in node))
+    if not unique_terms:
+        return report, structure
+    all_embeddings = get_term_embeddings(model_name, unique_terms)
+    row_of = {term: i for i, term in enumerate(unique_terms)}
+
+    for path, node in leaves:
+        embeddings = all_embeddings[[row_of[str(term)] for term in node]]
+        outliers = detect_outliers_hdbscan(embeddings, threshold)
+
+        if outliers:
+            issue: Dict[str, Any] = {"path": "/".join(path), "outliers": []}
+            for idx, score in outliers:
+                cast(List[Dict[str, Any]], issue["outliers"]).append({"term": node[idx], "score": round(score, 3)})
+            cast(List[Any], report["issues"]).append(issue)
 
-    traverse(structure, [])
     return report, structure
 
 
@@ -193,7 +361,13 @@ def clean_list(terms: List[str], model: Any, threshold: float = 0.1) -> Tuple[Li
     if len(terms) < 3:
         return terms, []
 
-    embeddings = compute_list_embeddings(model, terms)
+    return split_outliers(terms, compute_list_embeddings(model, terms), threshold)
+
+
+def split_outliers(terms: List[str], embeddings: np.ndarray, threshold: float = 0.1) -> Tuple[List[str], List[str]]:
+    """
+    Split terms into (cleaned_terms, outliers) given their embeddings, one row per term.
+    """
     outlier_indices_scores = detect_outliers_hdbscan(embeddings, threshold)
 
     if not outlier_indices_scores:
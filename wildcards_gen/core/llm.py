@@ -9,15 +9,87 @@ Handles communication with OpenRouter API for:
 Ported from wildcards-categorize.
 """
 
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, cast
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar, cast
 
 import requests
+from ruamel.yaml.comments import CommentedMap
+
+from .structure import StructureManager, loads_json, merge_categorized_data
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Terms sent per categorization request; longer lists are split into batches.
+CATEGORIZE_BATCH_SIZE = 200
+# Batch requests in flight at once, kept low to stay within provider rate limits.
+CATEGORIZE_MAX_WORKERS = 4
+# Categorize responses kept per engine, keyed on the exact prompt.
+CATEGORIZE_CACHE_SIZE = 256
+# YAML characters per enrichment request; larger structures are split by top-level category.
+ENRICH_CHUNK_CHARS = 8000
+# Enrichment requests in flight at once.
+ENRICH_MAX_WORKERS = 4
+
+
+def _copy_top_level(src: CommentedMap, dst: CommentedMap) -> None:
+    """Copy top-level keys of src into dst along with their end-of-line comments."""
+    for key, value in src.items():
+        dst[key] = value
+        if key in src.ca.items:
+            dst.ca.items[key] = src.ca.items[key]
+
+
+def _add_case_variants(node: Any, variants: Dict[str, List[str]]) -> None:
+    """
+    Place the other spellings of each categorized term right after it, in place.
+
+    variants maps a casefolded term to the spellings that were not sent.
+    """
+    if isinstance(node, dict):
+        for value in node.values():
+            _add_case_variants(value, variants)
+    elif isinstance(node, list):
+        expanded: List[Any] = []
+        for item in node:
+            expanded.append(item)
+            if isinstance(item, str):
+                expanded.extend(v for v in variants.get(item.casefold(), ()) if v != item)
+        node[:] = expanded
+
+
+def _split_top_level(mgr: StructureManager, data: CommentedMap, chunk_chars: int) -> List[str]:
+    """
+    Group top-level categories into YAML documents of about chunk_chars each.
+
+    A single category larger than chunk_chars gets a chunk of its own.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for key in data:
+        branch = CommentedMap()
+        branch[key] = data[key]
+        if key in data.ca.items:
+            branch.ca.items[key] = data.ca.items[key]
+        text = mgr.to_string(branch)
+        if current and size + len(text) > chunk_chars:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
 
 class LLMEngine:
     """Handles LLM API calls for taxonomy generation."""
@@ -32,6 +104,48 @@ class LLMEngine:
         self.model = model
         self.base_url = base_url
         self.prompts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+        # Pooled sessions: multi-call flows (dynamic structure, batched
+        # categorization) reuse the TLS connection instead of reconnecting.
+        # requests.Session is not thread-safe and the engine is shared by the
+        # categorize pool and concurrent GUI handlers, so each thread gets its own.
+        self._sessions = threading.local()
+        # Batch workers live as long as the engine, so their sessions (and open
+        # connections) carry over from one batch and one call to the next.
+        # Threads are only started once work is submitted.
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(CATEGORIZE_MAX_WORKERS, ENRICH_MAX_WORKERS), thread_name_prefix="llm"
+        )
+        # Re-running Categorize after editing a few terms re-sends mostly unchanged
+        # batches; serve those from memory. Raw JSON is kept so callers get fresh dicts.
+        self._categorize_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._categorize_cache_lock = threading.Lock()
+
+    @property
+    def _session(self) -> requests.Session:
+        """This thread's HTTP session, created on first use."""
+        session: Optional[requests.Session] = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(
+                {
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "https://github.com/tazztone/wildcards-gen",
+                }
+            )
+            self._sessions.session = session
+        return session
+
+    def _map_bounded(self, fn: Callable[[T], R], items: List[T], max_workers: int) -> List[R]:
+        """Run fn over items on the engine's pool, at most max_workers at a time, in input order."""
+        results: List[R] = []
+        in_flight: Deque["Future[R]"] = deque()
+        for item in items:
+            if len(in_flight) >= max_workers:
+                results.append(in_flight.popleft().result())
+            in_flight.append(self._pool.submit(fn, item))
+        results.extend(future.result() for future in in_flight)
+        return results
 
     def _load_prompt(self, filename: str) -> str:
         """Load a prompt template from file."""
@@ -72,12 +186,6 @@ class LLMEngine:
         timeout: int = 120,
     ) -> Optional[str]:
         """Make an API call to the LLM provider."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/tazztone/wildcards-gen",
-        }
-
         data: Dict[str, Any] = {
             "model": self.model,
             "messages": messages,
@@ -87,9 +195,8 @@ class LLMEngine:
 
         try:
             logger.info(f"Calling {self.base_url} with model {self.model}")
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
                 json=data,
                 timeout=timeout,
             )
@@ -123,17 +230,78 @@ class LLMEngine:
         response = self._call_api(messages)
         return self._clean_response(response) if response else None
 
-    def categorize_terms(self, terms: List[str], structure_yaml: str) -> Optional[Dict[str, Any]]:
+    def categorize_terms(
+        self,
+        terms: List[str],
+        structure_yaml: str,
+        batch_size: int = CATEGORIZE_BATCH_SIZE,
+        max_workers: int = CATEGORIZE_MAX_WORKERS,
+    ) -> Optional[Dict[str, Any]]:
         """
         Categorize terms into an existing structure.
 
+        Repeated terms are sent once, ignoring case; the first spelling is
+        sent and the others are placed next to it in the result. Lists longer
+        than batch_size are split and the batches are sent concurrently; their
+        results are merged in input order.
+
         Returns a dict representing the categorized terms.
         """
         prompt_template = self._load_prompt("categorize_terms.txt")
         if not prompt_template:
             return None
 
+        # Pasted lists often repeat terms, sometimes in another case; send each
+        # once and reapply its placement to the other spellings afterwards
+        spellings: Dict[str, List[str]] = {}
+        for term in terms:
+            seen = spellings.setdefault(term.casefold(), [])
+            if term not in seen:
+                seen.append(term)
+        unique_terms = [seen[0] for seen in spellings.values()]
+        if len(unique_terms) < len(terms):
+            logger.info(f"Skipping {len(terms) - len(unique_terms)} duplicate terms")
+        variants = {key: seen[1:] for key, seen in spellings.items() if len(seen) > 1}
+        terms = unique_terms
+
+        if len(terms) <= batch_size:
+            single = self._categorize_batch(prompt_template, terms, structure_yaml)
+            if single and variants:
+                _add_case_variants(single, variants)
+            return single
+
+        batches = [terms[i : i + batch_size] for i in range(0, len(terms), batch_size)]
+        results = self._map_bounded(
+            lambda b: self._categorize_batch(prompt_template, b, structure_yaml), batches, max_workers
+        )
+
+        merged: Dict[str, Any] = {}
+        failed = [batch for batch, result in zip(batches, results, strict=True) if not result]
+        for result in results:
+            if result:
+                merge_categorized_data(merged, result)
+        if failed and merged:
+            logger.warning(
+                f"Categorization failed for {len(failed)} of {len(batches)} batches; "
+                f"{sum(len(batch) for batch in failed)} terms were not categorized"
+            )
+        if merged and variants:
+            _add_case_variants(merged, variants)
+        return merged or None
+
+    def _categorize_batch(
+        self, prompt_template: str, terms: List[str], structure_yaml: str
+    ) -> Optional[Dict[str, Any]]:
+        """Run a single categorization request, reusing a cached response for an identical prompt."""
         prompt = prompt_template.format(structure_with_instructions=structure_yaml, terms=", ".join(terms))
+        cache_key = hashlib.sha256(f"{self.model}\0{prompt}".encode("utf-8")).hexdigest()
+
+        with self._categorize_cache_lock:
+            cached = self._categorize_cache.get(cache_key)
+            if cached is not None:
+                self._categorize_cache.move_to_end(cache_key)
+        if cached is not None:
+            return cast(Dict[str, Any], loads_json(cached))
 
         messages = [{"role": "user", "content": prompt}]
         response_text = self._call_api(messages, response_format={"type": "json_object"})
@@ -143,18 +311,76 @@ class LLMEngine:
 
         try:
             cleaned = self._clean_response(response_text)
-            return cast(Dict[str, Any], json.loads(cleaned))
+            result = cast(Dict[str, Any], loads_json(cleaned))
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON: {e}")
             logger.error(f"Response: {response_text}")
             return None
 
-    def enrich_instructions(self, structure_yaml: str, topic: str = "AI image generation wildcards") -> Optional[str]:
+        # Only well-formed responses are cached, so a retry can recover from a bad one
+        with self._categorize_cache_lock:
+            self._categorize_cache[cache_key] = cleaned
+            if len(self._categorize_cache) > CATEGORIZE_CACHE_SIZE:
+                self._categorize_cache.popitem(last=False)
+        return result
+
+    def enrich_instructions(
+        self,
+        structure_yaml: str,
+        topic: str = "AI image generation wildcards",
+        chunk_chars: int = ENRICH_CHUNK_CHARS,
+        max_workers: int = ENRICH_MAX_WORKERS,
+    ) -> Optional[str]:
         """
         Add or improve # instruction: comments in an existing structure.
 
+        Structures longer than chunk_chars are split into groups of top-level
+        categories that are enriched concurrently and reassembled in order.
+        A group whose response is missing or invalid is kept unchanged.
+
         Returns enhanced YAML string.
         """
+        if len(structure_yaml) <= chunk_chars:
+            return self._enrich_chunk(structure_yaml, topic)
+
+        mgr = StructureManager()
+        try:
+            data = mgr.from_string(structure_yaml)
+        except Exception as e:
+            logger.warning(f"Could not split structure for enrichment, sending it whole: {e}")
+            return self._enrich_chunk(structure_yaml, topic)
+
+        chunks = _split_top_level(mgr, data, chunk_chars) if isinstance(data, CommentedMap) else []
+        if len(chunks) < 2:
+            return self._enrich_chunk(structure_yaml, topic)
+
+        results = self._map_bounded(lambda c: self._enrich_chunk(c, topic), chunks, max_workers)
+
+        merged = CommentedMap()
+        enriched = 0
+        for original, result in zip(chunks, results, strict=True):
+            part = None
+            if result:
+                try:
+                    part = mgr.from_string(result)
+                except Exception as e:
+                    logger.error(f"Failed to parse enriched YAML: {e}")
+            if isinstance(part, CommentedMap):
+                enriched += 1
+            else:
+                part = mgr.from_string(original)
+            _copy_top_level(part, merged)
+
+        if not enriched:
+            return None
+        if enriched < len(chunks):
+            logger.warning(
+                f"Enrichment failed for {len(chunks) - enriched} of {len(chunks)} parts; kept them unchanged"
+            )
+        return mgr.to_string(merged)
+
+    def _enrich_chunk(self, structure_yaml: str, topic: str) -> Optional[str]:
+        """Run a single enrichment request over a YAML document."""
         prompt = f"""You are an expert at creating helpful descriptions for taxonomy categories.
 
 Given this YAML structure for {topic}:
@@ -0,0 +1,181 @@
+"""
+Persistent cache for LLM handler responses.
+
+Responses live in the embeddings SQLite database next to the arranger's
+embedding cache, so repeated requests survive restarts.
+
+Lookups are exact on (kind, model, input). When config.llm_cache_semantic
+is set, topic prompts can also match semantically: the topic is embedded
+with a small sentence-transformers model and compared against cached
+topics by cosine similarity. Term lists and YAML documents are only ever
+matched exactly, since a close but different input needs a different answer.
+"""
+
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Small, fast model: topics are only a few words
+TOPIC_EMBEDDING_MODEL = "minilm"
+# Entries kept in the database; least recently used ones are dropped first
+LLM_CACHE_MAX_ENTRIES = 1024
+
+
+@functools.lru_cache(maxsize=1)
+def _topic_encoder() -> Any:
+    """The shared topic embedding model, or None when it is unavailable."""
+    try:
+        # Same cached instance the linter and smart pruning use for this model
+        from .linter import load_embedding_model
+
+        return load_embedding_model(TOPIC_EMBEDDING_MODEL)
+    except ImportError:
+        logger.info("sentence-transformers not installed; LLM cache matches topics exactly")
+    except Exception as e:
+        logger.warning(f"Failed to load topic embedding model: {e}")
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _encode(text: str) -> Optional[np.ndarray]:
+    """Unit-length embedding of text, or None without an encoder."""
+    encoder = _topic_encoder()
+    if encoder is None:
+        return None
+    vec = np.asarray(encoder.encode([text], show_progress_bar=False)[0], dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else None
+
+
+class LLMResponseCache:
+    """SQLite-backed store of LLM outputs keyed by handler kind, model and input."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        threshold: Optional[float] = None,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path or config.db_path
+        self.threshold = config.llm_cache_threshold if threshold is None else threshold
+        self.max_entries = max_entries
+        # (kind, model) -> (keys, stacked unit vectors); dropped whenever the table changes
+        self._vectors: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]] = {}
+        self._vectors_lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_responses (
+                        key TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        output TEXT NOT NULL,
+                        vector BLOB,
+                        last_used REAL NOT NULL
+                    )
+                """)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to init LLM cache at {self.db_path}: {e}")
+
+    @staticmethod
+    def _key(kind: str, model: str, text: str) -> str:
+        return hashlib.sha256(f"{kind}\0{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, kind: str, model: str, text: str, semantic: bool = False) -> Optional[str]:
+        """
+        Return the cached output for text, or None on a miss.
+
+        With semantic=True, a miss falls back to the most similar cached input
+        of the same kind and model if it scores at least the threshold.
+        """
+        key = self._key(kind, model, text)
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT output FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                if row is None and semantic:
+                    key, row = self._nearest(conn, kind, model, text)
+                if row is None:
+                    return None
+                conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+                return str(row[0])
+        except sqlite3.Error as e:
+            logger.debug(f"LLM cache read failed: {e}")
+            return None
+
+    def put(self, kind: str, model: str, text: str, output: str, semantic: bool = False) -> None:
+        """Store output for text; semantic=True also stores its embedding for similarity lookups."""
+        vec = _encode(text) if semantic else None
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, kind, model, output, vector, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self._key(kind, model, text),
+                        kind,
+                        model,
+                        output,
+                        vec.tobytes() if vec is not None else None,
+                        time.time(),
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN"
+                    " (SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+        with self._vectors_lock:
+            self._vectors.clear()
+
+    def _nearest(self, conn: sqlite3.Connection, kind: str, model: str, text: str) -> Tuple[str, Optional[Any]]:
+        vec = _encode(text)
+        if vec is None:
+            return "", None
+
+        keys, matrix = self._load_vectors(conn, kind, model)
+        if not keys:
+            return "", None
+
+        # Rows are unit vectors, so one matmul gives every cosine similarity
+        scores = matrix @ vec
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return "", None
+
+        logger.info(f"LLM cache: reusing {kind} response for a similar input (similarity {scores[best]:.2f})")
+        row = conn.execute("SELECT output FROM llm_responses WHERE key = ?", (keys[best],)).fetchone()
+        return keys[best], row
+
+    def _load_vectors(self, conn: sqlite3.Connection, kind: str, model: str) -> Tuple[List[str], np.ndarray]:
+        with self._vectors_lock:
+            cached = self._vectors.get((kind, model))
+        if cached is not None:
+            return cached
+
+        rows = conn.execute(
+            "SELECT key, vector FROM llm_responses WHERE kind = ? AND model = ? AND vector IS NOT NULL",
+            (kind, model),
+        ).fetchall()
+        keys = [row[0] for row in rows]
+        matrix = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows]) if rows else np.empty((0, 0))
+        with self._vectors_lock:
+            self._vectors[(kind, model)] = (keys, matrix)
+        return keys, matrix
@@ -1,3 +1,5 @@
+import queue
+import threading
 from typing import Optional, Protocol, Tuple
 
 from tqdm import tqdm as _tqdm
@@ -6,7 +8,7 @@ from tqdm import tqdm as _tqdm
 class ProgressCallback(Protocol):
     """Protocol for progress reporting."""
 
-    def __call__(self, progress: float | Tuple[int, int], desc: Optional[str] = None) -> None: ...
+    def __call__(self, progress: float | Tuple[int, Optional[int]], desc: Optional[str] = None) -> None: ...
 
 
 class TqdmProgress:
@@ -15,7 +17,7 @@ class TqdmProgress:
     def __init__(self, total: Optional[int] = None, desc: str = "", unit: str = "it"):
         self.pbar = _tqdm(total=total, desc=desc, unit=unit)
 
-    def __call__(self, progress: float | Tuple[int, int], desc: Optional[str] = None) -> None:
+    def __call__(self, progress: float | Tuple[int, Optional[int]], desc: Optional[str] = None) -> None:
         """
         Update progress.
         If progress is float (0.0-1.0), we can't easily set tqdm unless we track total.
@@ -52,3 +54,32 @@ class NullProgress:
 
     def __call__(self, *args, **kwargs):
         pass
+
+
+class GenerationCancelled(BaseException):
+    """
+    Raised from a progress callback once its consumer has gone away.
+
+    A BaseException, like KeyboardInterrupt, so the broad ``except Exception``
+    handlers along the generation path do not swallow it.
+    """
+
+
+class QueueProgress:
+    """
+    Progress sink that forwards updates to a queue for another thread to consume.
+
+    Once ``cancelled`` is set, the next update raises GenerationCancelled so
+    the producing thread stops at its next progress report.
+    """
+
+    def __init__(self, updates: queue.Queue, cancelled: Optional[threading.Event] = None):
+        self.updates = updates
+        self.cancelled = cancelled
+
+    def __call__(
+        self, progress: float | Tuple[int, Optional[int]], desc: Optional[str] = None, *args, **kwargs
+    ) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise GenerationCancelled()
+        self.updates.put((progress, desc))
@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, cast
 from ruamel.yaml.comments import CommentedMap
 
 from .config import config
+from .structure import add_eol_comment
 
 logger = logging.getLogger(__name__)
 
@@ -242,7 +243,7 @@ class ConstraintShaper:
                         comment = config.instruction_template.format(gloss="Miscellaneous items")
                     else:
                         comment = config.instruction_template.format(gloss=f"Miscellaneous {instr_context}")
-                    processed_node.yaml_add_eol_comment(comment, other_label)
+                    add_eol_comment(processed_node, other_label, comment)
                 except Exception as e:
                     logger.debug(f"Failed to add shaper comment: {e}")
             else:
@@ -5,8 +5,10 @@ This module encapsulates the "Semantic Significance" logic used to decide
 whether a node should be a full category or flattened into a list.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import contextlib
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
 
+from .progress import ProgressCallback
 from .wordnet import (
     get_synset_wnid,
 )
@@ -16,12 +18,28 @@ class TraversalBudget:
     """
     Simple budget tracker for Fast Preview mode.
     Thread-safe enough for recursive calls (not concurrent threads).
+
+    Every extractor consumes it once per visited node, so it also reports
+    traversal progress when given a callback.
     """
 
-    def __init__(self, limit: Optional[int]):
+    # Nodes visited between progress reports
+    PROGRESS_EVERY = 250
+
+    def __init__(
+        self,
+        limit: Optional[int],
+        progress_callback: Optional[ProgressCallback] = None,
+        total: Optional[int] = None,
+    ):
         self.limit = limit
         self.current = 0
         self._exhausted = False
+        self.progress_callback = progress_callback
+        # A preview limit caps the traversal, so it is the better estimate
+        self.total = limit if limit is not None else total
+        self.visited = 0
+        self._next_report = 0
 
     def consume(self, amount: int = 1) -> bool:
         """
@@ -29,6 +47,12 @@ class TraversalBudget:
         Returns True if budget was available (success).
         Returns False if budget is exhausted (should stop).
         """
+        if self.progress_callback is not None:
+            self.visited += amount
+            if self.visited >= self._next_report:
+                self._next_report = self.visited + self.PROGRESS_EVERY
+                self.progress_callback((self.visited, self.total), desc=f"Extracting hierarchy: {self.visited} nodes")
+
         if self.limit is None:
             return True
 
@@ -344,6 +368,18 @@ def should_prune_node(synset: Any, child_count: int, is_root: bool, config: Smar
     return True
 
 
+def semantic_cleaning_pass() -> ContextManager[None]:
+    """
+    Batch the term vectors a cleaning pass encodes into one database write.
+    A no-op where the semantic dependencies are missing.
+    """
+    try:
+        from .linter import batched_term_writes
+    except ImportError:
+        return contextlib.nullcontext()
+    return batched_term_writes()
+
+
 def apply_semantic_cleaning(items: List[str], config: SmartConfig) -> List[str]:
     """
     Clean a list of items using semantic embeddings if enabled.
@@ -352,11 +388,13 @@ def apply_semantic_cleaning(items: List[str], config: SmartConfig) -> List[str]:
     if not config.enabled or not config.semantic_cleanup or not items:
         return items
 
-    from .linter import check_dependencies, clean_list, load_embedding_model
+    from .linter import check_dependencies, get_term_embeddings, split_outliers
 
-    if not check_dependencies():
+    if not check_dependencies() or len(items) < 3:
         return items
 
-    model = load_embedding_model(config.semantic_model)
-    cleaned, _ = clean_list(items, model, config.semantic_threshold)
+    # Live preview reruns this on every slider change; cached term vectors
+    # mean only terms never seen with this model reach it
+    embeddings = get_term_embeddings(config.semantic_model, [str(item) for item in items])
+    cleaned, _ = split_outliers(items, embeddings, config.semantic_threshold)
     return cleaned
@@ -3,6 +3,8 @@ import time
 from dataclasses import asdict, dataclass, field
 from typing import Any, Dict, List, Optional
 
+from .structure import atomic_output
+
 
 @dataclass
 class StatsEvent:
@@ -44,11 +46,15 @@ class StatsCollector:
         """Set execution metadata (e.g., config parameters)."""
         self.metadata[key] = value
 
+    def duration_seconds(self) -> float:
+        """Elapsed time since collection started, rounded for display."""
+        return round(time.time() - self.start_time, 2)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert all stats to a serializable dictionary."""
         return {
             "execution": {
-                "duration_seconds": round(time.time() - self.start_time, 2),
+                "duration_seconds": self.duration_seconds(),
                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             },
             "metadata": self.metadata,
@@ -58,7 +64,7 @@ class StatsCollector:
     def save_to_json(self, path: str):
         """Save structured stats to a JSON file."""
         try:
-            with open(path, "w", encoding="utf-8") as f:
+            with atomic_output(path) as f:
                 json.dump(self.to_dict(), f, indent=2)
         except Exception as e:
             print(f"Failed to save stats JSON: {e}")
@@ -66,7 +72,7 @@ class StatsCollector:
     def save_summary_log(self, path: str):
         """Save a human-readable summary log."""
         try:
-            with open(path, "w", encoding="utf-8") as f:
+            with atomic_output(path) as f:
                 f.write(f"Generation Summary - {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write("=" * 60 + "\n\n")
 
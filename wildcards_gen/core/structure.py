@@ -5,32 +5,215 @@ Uses ruamel.yaml to maintain # instruction: comments in the generated YAML.
 Ported from wildcards-categorize.
 """
 
+import contextlib
 import io
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import uuid
+from typing import IO, Any, Dict, Iterator, List, Optional, Set
 
+import yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
+from ruamel.yaml.emitter import RoundTripEmitter
+from ruamel.yaml.error import CommentMark
+from ruamel.yaml.tokens import CommentToken
 
 from .config import config
 
+try:
+    from yaml import CSafeLoader as _FastLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _FastLoader  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+if not yaml.__with_libyaml__:
+    logger.debug("PyYAML was built without libyaml; read-only YAML loads use the slower pure-Python parser")
+
+# Sentinel for keys absent from a structure (a present key may hold None).
+_MISSING = object()
+
+# Output directories already created by this process.
+_MADE_DIRS: Set[str] = set()
+
+# Emitters write many small chunks; a larger buffer batches them into fewer syscalls.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Set on maps from generated_map(); only those take add_eol_comment's direct path.
+_GENERATED_ATTR = "_wildcards_gen_generated"
+
+
+def generated_map() -> CommentedMap:
+    """
+    Create an empty CommentedMap whose comments will all come from add_eol_comment.
+
+    Such maps never hold comments at file-specific columns, so add_eol_comment
+    can write into them without resolving a column first.
+    """
+    node = CommentedMap()
+    setattr(node, _GENERATED_ATTR, True)
+    return node
+
+
+def add_eol_comment(node: CommentedMap, key: Any, comment: str) -> None:
+    """
+    Attach an end-of-line comment to ``key`` of ``node``.
+
+    On maps from generated_map() this gives the same result as
+    ``node.yaml_add_eol_comment(comment, key)`` but writes the comment token
+    straight into ``ca.items``. ruamel's version first resolves a column by
+    scanning every key of the map, which makes building wide categories
+    quadratic. Any other map, such as one loaded from a file, goes through
+    ruamel so the new comment lines up with what is already there.
+    """
+    if not getattr(node, _GENERATED_ATTR, False):
+        node.yaml_add_eol_comment(comment, key)
+        return
+    if not comment.startswith("#"):
+        comment = "# " + comment
+    # ruamel pads only a map's first comment; later ones borrow a neighbour's column.
+    if not node.ca.items:
+        comment = " " + comment
+    entry = node.ca.items.setdefault(key, [None, None, None, None])
+    entry[2] = CommentToken(comment, CommentMark(0))
+    entry[3] = None
+
+
+class _CachingEmitter(RoundTripEmitter):
+    """
+    Round-trip emitter that analyzes each distinct scalar once per dump.
+
+    Generated trees repeat the same terms and category names thousands of
+    times, and ruamel re-scans every character of each occurrence to pick a
+    quoting style. The analysis depends only on the string and on emitter
+    settings that are fixed for the dump, so it is reused.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._scalar_analysis: Dict[str, Any] = {}
+
+    def analyze_scalar(self, scalar: Any) -> Any:
+        try:
+            return self._scalar_analysis[scalar]
+        except KeyError:
+            analysis = self._scalar_analysis[scalar] = super().analyze_scalar(scalar)
+            return analysis
+
+
+def open_output(file_path: str, binary: bool = False) -> IO[Any]:
+    """Open file_path for writing, creating its directory once per process."""
+    parent = os.path.dirname(os.path.abspath(file_path))
+    if parent not in _MADE_DIRS:
+        os.makedirs(parent, exist_ok=True)
+        _MADE_DIRS.add(parent)
+    mode, encoding = ("wb", None) if binary else ("w", "utf-8")
+    try:
+        return open(file_path, mode, buffering=_WRITE_BUFFER_SIZE, encoding=encoding)
+    except FileNotFoundError:
+        # Directory was removed after we created it
+        os.makedirs(parent, exist_ok=True)
+        return open(file_path, mode, buffering=_WRITE_BUFFER_SIZE, encoding=encoding)
+
+
+@contextlib.contextmanager
+def atomic_output(file_path: str, binary: bool = False) -> Iterator[IO[Any]]:
+    """
+    Write to a temporary sibling of file_path and move it into place on success.
+
+    A crash or error mid-dump leaves the previous file intact instead of a
+    truncated one.
+    """
+    tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open_output(tmp_path, binary=binary) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def merge_categorized_data(current_structure: Dict[str, Any], categorized_data: Dict[str, Any]) -> None:
+    """
+    Recursively merge categorized data into existing structure.
+    Modifies current_structure in place.
+
+    New nodes are generated maps and CommentedSeq so instructions can be
+    attached to them afterwards with add_eol_comment.
+    """
+    # CommentedMap/CommentedSeq subclass dict/list, so plain isinstance checks cover both
+    for key, value in categorized_data.items():
+        existing = current_structure.get(key, _MISSING)
+        if isinstance(value, dict):
+            if existing is _MISSING:
+                existing = current_structure[key] = generated_map()
+
+            if isinstance(existing, dict):
+                merge_categorized_data(existing, value)
+            else:
+                logger.warning(f"Conflict at '{key}': existing is {type(existing)}, incoming is dict. Skipping.")
+
+        elif isinstance(value, list):
+            if existing is _MISSING:
+                current_structure[key] = CommentedSeq(value)
+            elif isinstance(existing, list):
+                # Append unique terms
+                existing_set = set(existing)
+                for item in value:
+                    if item not in existing_set:
+                        existing.append(item)
+                        existing_set.add(item)
+            else:
+                logger.warning(f"Conflict at '{key}': existing is {type(existing)}, incoming is list. Skipping.")
+
+
+def _json_default(obj: Any) -> Any:
+    # ruamel loads floats as ScalarFloat, a float subclass orjson won't encode
+    if isinstance(obj, float):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_json(data: Any) -> str:
+    """Compact JSON via orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads_json(text: str | bytes) -> Any:
+    """
+    Parse JSON via orjson when installed, stdlib json otherwise.
+
+    Both raise json.JSONDecodeError on bad input (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 class StructureManager:
     """Manages YAML structure with comment preservation using ruamel.yaml."""
 
     def __init__(self):
         self.yaml = YAML()
+        self.yaml.Emitter = _CachingEmitter
         self.yaml.preserve_quotes = True
         self.yaml.indent(mapping=2, sequence=4, offset=2)
         self.yaml.width = 4096
 
     def create_empty_structure(self) -> CommentedMap:
         """Create an empty CommentedMap structure."""
-        return CommentedMap()
+        return generated_map()
 
     def _format_comment(self, text: str) -> str:
         """Format comment using global template."""
@@ -51,7 +234,9 @@ class StructureManager:
             instruction: Optional instruction text (added as # instruction: comment)
         """
         if key not in parent_node:
-            parent_node[key] = CommentedMap()
+            # Categories stay CommentedMap: their own children may later get
+            # instruction comments, which ruamel stores on the parent map.
+            parent_node[key] = generated_map()
 
         if instruction:
             try:
@@ -59,7 +244,7 @@ class StructureManager:
                 if hasattr(parent_node, "ca") and key in parent_node.ca.items:
                     pass  # Comment exists
                 else:
-                    parent_node.yaml_add_eol_comment(self._format_comment(instruction), key)
+                    add_eol_comment(parent_node, key, self._format_comment(instruction))
             except Exception as e:
                 logger.warning(f"Failed to add comment for {key}: {e}")
 
@@ -79,23 +264,37 @@ class StructureManager:
             items: List of wildcard items
             instruction: Optional instruction for this category
         """
-        seq = CommentedSeq(items)
-        parent_node[key] = seq
+        # Comments attach to the parent's key, never to the list itself, so a
+        # plain list avoids CommentedSeq's per-node comment bookkeeping.
+        parent_node[key] = list(items)
 
         if instruction:
             try:
-                parent_node.yaml_add_eol_comment(self._format_comment(instruction), key)
+                add_eol_comment(parent_node, key, self._format_comment(instruction))
             except Exception as e:
                 logger.warning(f"Failed to add comment for {key}: {e}")
 
-    def load_structure(self, file_path: str) -> CommentedMap:
-        """Load YAML structure from file, preserving comments."""
-        if not os.path.exists(file_path):
+    def load_structure(self, file_path: str, preserve_comments: bool = True) -> CommentedMap:
+        """
+        Load YAML structure from file.
+
+        Args:
+            file_path: Input path
+            preserve_comments: Keep # instruction: comments (round-trip loader).
+                Pass False for read-only consumers to use the faster libyaml parser.
+        """
+        try:
+            # Slurp raw bytes in one read; ruamel detects the encoding itself.
+            with open(file_path, "rb") as f:
+                buf = f.read()
+        except FileNotFoundError:
+            return self.create_empty_structure()
+        except OSError as e:
+            logger.error(f"Failed to load structure from {file_path}: {e}")
             return self.create_empty_structure()
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = self.yaml.load(f)
+            data = self.yaml.load(buf) if preserve_comments else self.from_string_fast(buf)
             return data if data is not None else self.create_empty_structure()
         except Exception as e:
             logger.error(f"Failed to load structure from {file_path}: {e}")
@@ -120,12 +319,10 @@ class StructureManager:
             self._save_as_jsonl(data, file_path)
             return
 
-        # Default YAML save
-        content = self.to_string(data)
+        # Default YAML save: dump encoded bytes straight to the file
         try:
-            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            with atomic_output(file_path, binary=True) as f:
+                self.to_file(data, f)
             logger.info(f"Saved structure to {file_path}")
         except Exception as e:
             logger.error(f"Failed to save structure to {file_path}: {e}")
@@ -133,9 +330,7 @@ class StructureManager:
     def _save_as_jsonl(self, data: Any, file_path: str) -> None:
         """Save flattened hierarchy as JSONL."""
         try:
-            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-
-            with open(file_path, "w", encoding="utf-8") as f:
+            with atomic_output(file_path) as f:
                 self._write_jsonl_recursive(data, [], f)
 
             logger.info(f"Saved JSONL to {file_path}")
@@ -153,48 +348,52 @@ class StructureManager:
 
             for item in node:
                 entry = {"text": item, "label": label, "hierarchy": path}
-                file_obj.write(json.dumps(entry) + "\n")
+                file_obj.write(self.to_json(entry) + "\n")
+
+    def to_file(self, data: Any, stream: IO[bytes]) -> None:
+        """Write structure as YAML to a binary stream without building the text in memory."""
+        self.yaml.dump(data, stream)
 
     def to_string(self, data: Any) -> str:
         """Convert structure to YAML string."""
-        buf = io.StringIO()
+        # ruamel emits utf-8 bytes natively; decoding once beats per-token str writes
+        buf = io.BytesIO()
         self.yaml.dump(data, buf)
-        return buf.getvalue()
+        return buf.getvalue().decode("utf-8")
 
     def from_string(self, text: str) -> Any:
         """Parse YAML string to structure."""
         return self.yaml.load(text)
 
-    def merge_categorized_data(self, current_structure: CommentedMap, categorized_data: Dict[str, Any]) -> None:
+    def from_string_fast(self, text: str | bytes) -> Any:
+        """
+        Parse YAML string to plain dicts/lists.
+
+        Uses PyYAML's libyaml-backed loader, several times faster than the
+        round-trip loader, but comments are dropped. Only use it where the
+        result is read and never re-emitted.
+        """
+        return yaml.load(text, Loader=_FastLoader)
+
+    def to_json(self, data: Any) -> str:
+        """
+        Serialize structure to compact JSON.
+
+        For intermediate data that is never shown to users: much faster than
+        YAML, but comments and key styles are lost. Uses orjson when installed.
+        """
+        return dumps_json(data)
+
+    def from_json(self, text: str | bytes) -> Any:
+        """Parse JSON produced by to_json into plain dicts/lists."""
+        return loads_json(text)
+
+    def merge_categorized_data(self, current_structure: Dict[str, Any], categorized_data: Dict[str, Any]) -> None:
         """
         Recursively merge categorized data into existing structure.
         Modifies current_structure in place.
         """
-        for key, value in categorized_data.items():
-            if isinstance(value, dict):
-                if key not in current_structure:
-                    current_structure[key] = self.create_empty_structure()
-
-                if isinstance(current_structure[key], (dict, CommentedMap)):
-                    self.merge_categorized_data(current_structure[key], value)
-                else:
-                    logger.warning(
-                        f"Conflict at '{key}': existing is {type(current_structure[key])}, incoming is dict. Skipping."
-                    )
-
-            elif isinstance(value, list):
-                if key not in current_structure:
-                    current_structure[key] = CommentedSeq(value)
-                elif isinstance(current_structure[key], (list, CommentedSeq)):
-                    # Append unique terms
-                    existing_set = set(current_structure[key])
-                    for item in value:
-                        if item not in existing_set:
-                            current_structure[key].append(item)
-                else:
-                    logger.warning(
-                        f"Conflict at '{key}': existing is {type(current_structure[key])}, incoming is list. Skipping."
-                    )
+        merge_categorized_data(current_structure, categorized_data)
 
     def extract_terms(self, data: Any) -> List[str]:
         """Extract all leaf terms from a structure."""
@@ -9,18 +9,42 @@ Provides functions to:
 
 import functools
 import logging
-from typing import Any, Collection, List, Optional, Set
+import sys
+import threading
+from typing import Any, Callable, Collection, Dict, FrozenSet, List, Optional, Set
 
 import nltk
 from nltk.corpus import wordnet as wn
 
 logger = logging.getLogger(__name__)
 
+# Set once the lazy WordNet corpus reader has been forced to load its indexes.
+_WN_READY = False
+
+# Bound once the reader is loaded; binding earlier would go through the lazy proxy.
+_synset_from_pos_and_offset: Optional[Callable[[str, int], Any]] = None
+
+# NLTK's lazy loader is not safe to trigger from two threads at once (the GUI
+# warms it in the background while handlers may already use it).
+_WN_LOCK = threading.Lock()
+
+
+def _ensure_wn_loaded() -> None:
+    """Load the WordNet corpus once per process instead of on every lookup."""
+    global _WN_READY, _synset_from_pos_and_offset
+    if _WN_READY:
+        return
+    with _WN_LOCK:
+        if not _WN_READY:
+            wn.ensure_loaded()
+            _synset_from_pos_and_offset = wn.synset_from_pos_and_offset
+            _WN_READY = True
+
 
 def ensure_nltk_data() -> None:
     """Ensure NLTK WordNet data is available."""
     try:
-        wn.ensure_loaded()
+        _ensure_wn_loaded()
     except LookupError:
         logger.info("Downloading WordNet data...")
         try:
@@ -31,7 +55,7 @@ def ensure_nltk_data() -> None:
             raise
 
 
-@functools.lru_cache(maxsize=10000)
+@functools.lru_cache(maxsize=None)
 def get_synset_from_wnid(wnid: str) -> Optional[Any]:
     """
     Get a WordNet synset from a WNID (e.g., 'n02084071').
@@ -42,26 +66,32 @@ def get_synset_from_wnid(wnid: str) -> Optional[Any]:
     Returns:
         Synset object or None if not found
     """
+    if len(wnid) < 2:
+        return None
     try:
-        if len(wnid) < 2:
-            return None
-        pos = wnid[0]
-        offset = int(wnid[1:])
-        return wn.synset_from_pos_and_offset(pos, offset)
+        if _synset_from_pos_and_offset is None:
+            _ensure_wn_loaded()
+        return _synset_from_pos_and_offset(wnid[0], int(wnid[1:]))  # type: ignore[misc]
     except Exception:
         return None
 
 
-@functools.lru_cache(maxsize=10000)
+@functools.lru_cache(maxsize=None)
 def get_primary_synset(word: str) -> Optional[Any]:
     """
     Get the primary (most common) synset for a word.
 
     This filters out obscure or secondary meanings and prioritizes
     domain-relevant lexical categories (food, plants, animals, artifacts).
+
+    Unbounded cache: the working set is bounded by the vocabulary size and
+    evicting entries on large datasets (Tencent, ImageNet-21k) forces costly
+    re-lookups.
     """
     try:
-        synsets = wn.synsets(word.replace(" ", "_"), pos=wn.NOUN)
+        _ensure_wn_loaded()
+        key = word.replace(" ", "_")
+        synsets = wn.synsets(key, pos=wn.NOUN)
         if not synsets:
             return None
 
@@ -97,11 +127,18 @@ def get_primary_synset(word: str) -> Optional[Any]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def get_synset_name(synset: Any) -> str:
-    """Get clean name from synset (e.g., 'dog' from 'dog.n.01')."""
-    return str(synset.lemmas()[0].name().replace("_", " "))
+    """
+    Get clean name from synset (e.g., 'dog' from 'dog.n.01').
+
+    Names are interned: the same term recurs under many categories of large
+    trees, and every occurrence then shares one string object.
+    """
+    return sys.intern(str(synset.lemmas()[0].name().replace("_", " ")))
 
 
+@functools.lru_cache(maxsize=None)
 def get_synset_gloss(synset: Any) -> str:
     """
     Get the gloss (definition) of a synset.
@@ -112,9 +149,29 @@ def get_synset_gloss(synset: Any) -> str:
     return str(synset.definition())
 
 
+# Instance attribute used to memoize a synset's WNID on the synset itself.
+_WNID_ATTR = "_wildcards_gen_wnid"
+
+
 def get_synset_wnid(synset) -> str:
-    """Get WNID from synset (e.g., 'n02084071')."""
-    return f"{synset.pos()}{synset.offset():08d}"
+    """
+    Get WNID from synset (e.g., 'n02084071').
+
+    The result is stored on the synset: NLTK keeps one Synset object per
+    offset alive for the whole process, and an instance-dict hit is cheaper
+    than hashing the synset name into a separate cache.
+    """
+    try:
+        return str(synset.__dict__[_WNID_ATTR])
+    except (KeyError, AttributeError):
+        pass
+
+    wnid = f"{synset.pos()}{synset.offset():08d}"
+    try:
+        synset.__dict__[_WNID_ATTR] = wnid
+    except AttributeError:
+        pass
+    return wnid
 
 
 def is_in_valid_set(synset: Any, valid_wnids: Optional[Collection[str]]) -> bool:
@@ -124,23 +181,36 @@ def is_in_valid_set(synset: Any, valid_wnids: Optional[Collection[str]]) -> bool
     return get_synset_wnid(synset) in valid_wnids
 
 
+@functools.lru_cache(maxsize=8)
+def _index_wnids_by_pos(valid_wnids: FrozenSet[str]) -> Dict[str, FrozenSet[int]]:
+    """Split WNIDs like 'n02084071' into integer offsets grouped by part of speech."""
+    by_pos: Dict[str, Set[int]] = {}
+    for wnid in valid_wnids:
+        if len(wnid) > 1 and wnid[1:].isdigit():
+            by_pos.setdefault(wnid[0], set()).add(int(wnid[1:]))
+    return {pos: frozenset(offsets) for pos, offsets in by_pos.items()}
+
+
 @functools.lru_cache(maxsize=1024)
 def _get_all_descendants_cached(synset, valid_wnids: Optional[frozenset] = None) -> List[str]:
     """Cached implementation of descendant traversal."""
-    descendants = set()
+    descendants: Set[str] = set()
     try:
-        # closure() can be slow for high-up nodes like 'entity.n.01'
-        for s in synset.closure(lambda s: s.hyponyms()):
-            name = get_synset_name(s)
-            if valid_wnids:
-                if is_in_valid_set(s, valid_wnids):
-                    descendants.add(name)
-            else:
-                descendants.add(name)
+        # closure() can be slow for high-up nodes like 'entity.n.01'.
+        # Names are built inline and the filter check is hoisted out of the
+        # loop, as this is the hottest path of tree generation.
+        closure = synset.closure(lambda s: s.hyponyms())
+        if valid_wnids:
+            # Hyponymy never crosses parts of speech, so the root's POS covers the
+            # whole closure and each node is matched on its integer offset alone.
+            offsets = _index_wnids_by_pos(valid_wnids).get(synset.pos(), frozenset())
+            descendants = {sys.intern(s.lemmas()[0].name().replace("_", " ")) for s in closure if s.offset() in offsets}
+        else:
+            descendants = {sys.intern(s.lemmas()[0].name().replace("_", " ")) for s in closure}
     except Exception as e:
         logger.warning(f"Error traversing descendants of {synset}: {e}")
 
-    return sorted(list(descendants))
+    return sorted(descendants)
 
 
 def get_all_descendants(synset, valid_wnids: Optional[Set[str]] = None) -> List[str]:
@@ -153,23 +223,27 @@ def get_all_descendants(synset, valid_wnids: Optional[Set[str]] = None) -> List[
 
 
 # Categories to optionally blacklist (too abstract)
-ABSTRACT_CATEGORIES = {
-    "entity",
-    "abstraction",
-    "communication",
-    "measure",
-    "attribute",
-    "state",
-    "event",
-    "act",
-    "group",
-    "relation",
-    "possession",
-    "phenomenon",
-}
+ABSTRACT_CATEGORIES = frozenset(
+    {
+        "entity",
+        "abstraction",
+        "communication",
+        "measure",
+        "attribute",
+        "state",
+        "event",
+        "act",
+        "group",
+        "relation",
+        "possession",
+        "phenomenon",
+    }
+)
 
 
 def is_abstract_category(synset) -> bool:
     """Check if synset is an abstract category that should be blacklisted."""
-    lemma = synset.name().split(".")[0]
-    return lemma in ABSTRACT_CATEGORIES
+    # Synset names are 'lemma.pos.nn'; slice up to the first dot instead of split()
+    name = synset.name()
+    dot = name.find(".")
+    return (name if dot < 0 else name[:dot]) in ABSTRACT_CATEGORIES
@@ -1,22 +1,38 @@
 import datetime
+import functools
+import hashlib
+import itertools
+import json
 import logging
 import os
-from typing import Any, Dict, cast
+import queue
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, cast
 
 import gradio as gr
-from nltk.corpus import wordnet as wn
 
-from wildcards_gen.core.builder import TaxonomyNode
+from wildcards_gen.core import analyze, linter
 from wildcards_gen.core.config import config
 
 # Local Imports
-from wildcards_gen.core.datasets import coco, imagenet, openimages, tencent
-from wildcards_gen.core.llm import LLMEngine
+# NLTK, the dataset backends and the LLM engine are imported where they are
+# first used: NLTK alone adds about a second before the UI can come up.
+from wildcards_gen.core.progress import QueueProgress
 from wildcards_gen.core.stats import StatsCollector
-from wildcards_gen.core.structure import StructureManager
+from wildcards_gen.core.structure import StructureManager, atomic_output
 
 from .core.presets import DATASET_PRESET_OVERRIDES, SMART_PRESETS
 
+if TYPE_CHECKING:
+    from wildcards_gen.core.llm import LLMEngine
+    from wildcards_gen.core.llm_cache import LLMResponseCache
+
 # =============================================================================
 # 1. SETUP & LOGGING
 # =============================================================================
@@ -30,6 +46,45 @@ with open(CSS_PATH, "r") as f:
 # =============================================================================
 # 2. CONSTANTS
 # =============================================================================
+# Characters stripped from user text when deriving output filenames
+_FILENAME_UNSAFE_RE = re.compile(r"[^a-z0-9_.]")
+
+# Filename callbacks fire while typing: coalesce bursts into the latest value
+# and skip the progress overlay on the output box.
+FILENAME_EVENT_KW: Dict[str, Any] = {"trigger_mode": "always_last", "show_progress": "hidden"}
+
+# Lines of generated YAML shown in the preview pane
+PREVIEW_MAX_LINES = 500
+
+# Served download links kept in Gradio's folder; older ones are removed as new
+# files are served, so links handed out recently still return their own bytes.
+SERVED_LINKS_KEPT = 64
+
+# LLM handlers mostly wait on the network, so let several sessions run at once
+# instead of Gradio's default of one in flight per event. All LLM events share
+# one concurrency group so the cap applies to the provider, not to each button.
+LLM_CONCURRENCY_LIMIT = 4
+LLM_EVENT_KW: Dict[str, Any] = {"concurrency_limit": LLM_CONCURRENCY_LIMIT, "concurrency_id": "llm"}
+
+# Pending requests accepted before new ones are turned away
+QUEUE_MAX_SIZE = 64
+
+# Dry-run analyses kept in memory. Users re-run Analyze while tuning, and the
+# source datasets do not change within a session.
+ANALYSIS_CACHE_SIZE = 32
+_ANALYSIS_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[Dict[str, Any], Dict[str, int]]]" = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+# Summaries are also kept in the embeddings database so a restart does not
+# repeat the traversal; older entries are rebuilt in case the data was updated.
+ANALYSIS_STORE_MAX_AGE = 7 * 24 * 3600
+# Downloaded files each analyzed dataset reads. Their size and mtime are part of
+# the cache key, so a replaced or edited file is analyzed again.
+ANALYSIS_SOURCE_FILES = {
+    "ImageNet": ("imagenet_class_index.json", "imagenet21k_wordnet_ids.txt", "imagenet21k_wordnet_lemmas.txt"),
+    "Open Images": ("bbox_labels_600_hierarchy.json", "oidv7-class-descriptions.csv"),
+    "Tencent ML-Images": ("tencent_hierarchy.txt",),
+}
+
 # Defined at module level to be shared by multiple UI components
 COMMON_ROOTS = {
     "— General —": "",
@@ -66,16 +121,24 @@ COMMON_ROOTS = {
     "Communication": "communication.n.02",
 }
 
+# Blurb shown under the dataset dropdown
+DATASET_INFO = {
+    "ImageNet": "_**ImageNet**: 21k classes. Best for general objects/animals._",
+    "COCO": "_**COCO**: 80 objects. Very small, flat list._",
+    "Open Images": "_**Open Images V7**: ~600 bbox classes or 20k+ image labels._",
+    "Tencent ML-Images": "_**Tencent ML**: 11k categories. Massive, modern coverage._",
+}
+
+# Datasets with a WordNet-backed hierarchy that Smart mode can prune
+SMART_DATASETS = frozenset({"ImageNet", "Open Images", "Tencent ML-Images"})
+
 
 # =============================================================================
 # 3. UTILITY FUNCTIONS (PURE & FORMATTING)
 # =============================================================================
 def clean_filename(s):
     """Clean string for use in filename."""
-    import re
-
-    s = s.lower().replace(" ", "_")
-    return re.sub(r"[^a-z0-9_.]", "", s)
+    return _FILENAME_UNSAFE_RE.sub("", s.lower().replace(" ", "_"))
 
 
 def update_ds_filename(
@@ -91,7 +154,8 @@ def update_ds_filename(
     # Only use root in filename if it's ImageNet, otherwise ignore the hidden input
     root_part = ""
     if name == "ImageNet":
-        root_part = clean_filename(root.split(".")[0]) if "." in root else clean_filename(root)
+        # Synset stem only: 'dog.n.01' -> 'dog' (partition stops at the first dot)
+        root_part = clean_filename(root.partition(".")[0])
 
     name_part = clean_filename(name)
     bbox_suffix = "_bbox" if (bbox_only and name == "Open Images") else ""
@@ -122,7 +186,8 @@ def update_cr_filename(topic):
 def update_cat_filename(terms):
     if not terms:
         return "categorized.yaml"
-    first_term = terms.split("\n")[0][:20]
+    # partition() stops at the first newline instead of splitting the whole list
+    first_term = terms.partition("\n")[0][:20]
     return f"categorized_{clean_filename(first_term)}.yaml"
 
 
@@ -135,28 +200,147 @@ def update_en_filename(topic):
 # =============================================================================
 # 4. LOGIC HELPERS (IO & STATE)
 # =============================================================================
-def save_and_preview(data, output_name):
-    """Helper to save structure and return path + content."""
-    mgr = StructureManager()
-    yaml_str = mgr.to_string(data)
+# Building ruamel's YAML() is costly, so handlers reuse one manager per worker
+# thread. A YAML instance holds emitter state mid-dump and cannot be shared.
+_MGR_LOCAL = threading.local()
+
+
+def _structure_manager() -> StructureManager:
+    """Return this thread's StructureManager, creating it on first use."""
+    mgr = getattr(_MGR_LOCAL, "mgr", None)
+    if mgr is None:
+        mgr = _MGR_LOCAL.mgr = StructureManager()
+    return mgr
+
+
+@functools.lru_cache(maxsize=8)
+def _llm_engine(api_key: str, model: str) -> "LLMEngine":
+    """Return a shared engine per key/model so its HTTP session stays warm across clicks."""
+    from wildcards_gen.core.llm import LLMEngine
+
+    return LLMEngine(api_key=api_key, model=model)
+
+
+def _response_cache() -> "Optional[LLMResponseCache]":
+    """Persistent LLM response cache, or None when disabled in config."""
+    if not config.llm_cache_enabled:
+        return None
+    return _shared_response_cache()
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_response_cache() -> "LLMResponseCache":
+    from wildcards_gen.core.llm_cache import LLMResponseCache
+
+    return LLMResponseCache()
+
+
+def _served_path(path: str) -> str:
+    """
+    Hard-link a finished output into Gradio's upload folder and return the link.
+
+    Gradio hashes and then copies any returned file that lives outside that
+    folder, two extra passes over a multi-megabyte YAML. A link is served in
+    place. Outputs are written by replacing the file, so each version gets a
+    folder keyed on its inode, mtime and size: a URL issued for an earlier run
+    keeps serving that run's bytes until SERVED_LINKS_KEPT newer folders push
+    it out. Falls back to the original path where links are not possible, such
+    as when the folder is on another filesystem.
+    """
+    get_upload_folder = getattr(gr.utils, "get_upload_folder", None)
+    if get_upload_folder is None:
+        return path
+    try:
+        st = os.stat(path)
+        identity = f"{os.path.abspath(path)}\0{st.st_ino}\0{st.st_mtime_ns}\0{st.st_size}"
+        served_root = os.path.join(get_upload_folder(), "wildcards_gen")
+        link_dir = os.path.join(served_root, hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16])
+        link = os.path.join(link_dir, os.path.basename(path))
+        if os.path.exists(link):
+            return link
+        os.makedirs(link_dir, exist_ok=True)
+        os.link(path, link)
+    except FileExistsError:
+        # Another handler served the same version first
+        return link
+    except OSError as e:
+        logger.debug(f"Serving {path} through a copy: {e}")
+        return path
+    _prune_served_links(served_root)
+    return link
+
+
+def _prune_served_links(served_root: str) -> None:
+    """Remove all but the SERVED_LINKS_KEPT most recently created link folders."""
+    try:
+        entries = [entry for entry in os.scandir(served_root) if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    if len(entries) <= SERVED_LINKS_KEPT:
+        return
+    entries.sort(key=lambda entry: entry.stat(follow_symlinks=False).st_mtime_ns, reverse=True)
+    for entry in entries[SERVED_LINKS_KEPT:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def save_and_preview(data, output_name, serve=True):
+    """
+    Helper to save structure and return path + content.
+
+    With serve=False the output path itself is returned instead of a link in
+    Gradio's folder, for callers that only show the preview.
+    """
+    mgr = _structure_manager()
 
-    output_dir = config.output_dir
-    os.makedirs(output_dir, exist_ok=True)
     if not output_name.endswith(".yaml"):
         output_name += ".yaml"
-    output_path = os.path.join(output_dir, output_name)
+    output_path = os.path.join(config.output_dir, output_name)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(yaml_str)
+    # Dump straight to disk rather than holding the full YAML text in memory
+    with atomic_output(output_path, binary=True) as f:
+        mgr.to_file(data, f)
+
+    # Read back only what the preview shows, truncated to avoid UI lag
+    with open(output_path, "r", encoding="utf-8") as f:
+        lines = list(itertools.islice(f, PREVIEW_MAX_LINES + 1))
+    preview_str = "".join(lines[:PREVIEW_MAX_LINES])
+    if len(lines) > PREVIEW_MAX_LINES:
+        preview_str += "\n# ... (Preview truncated. Download file to view full content.)"
+
+    return (_served_path(output_path) if serve else output_path), preview_str
 
-    # Truncate for preview to avoid UI lag
-    lines = yaml_str.split("\n")
-    if len(lines) > 500:
-        preview_str = "\n".join(lines[:500]) + "\n\n# ... (Preview truncated. Download file to view full content.)"
-    else:
-        preview_str = yaml_str
 
-    return output_path, preview_str
+@functools.lru_cache(maxsize=4096)
+def _wordnet_choices(key: str) -> Tuple[Tuple[str, str], ...]:
+    """Dropdown choices for a normalized query, cached across searches."""
+    from nltk.corpus import wordnet as wn
+
+    from wildcards_gen.core.wordnet import ensure_nltk_data, get_synset_gloss, get_synset_wnid
+
+    # Loads through the guarded loader, so a search never races the startup warm-up
+    ensure_nltk_data()
+    choices = []
+    for s in wn.synsets(key)[:15]:  # Limit to top 15
+        # Label: dog.n.01 (n02084071): a domesticated carnivorous...
+        # Value: dog.n.01
+        # Truncate definition to keep UI clean
+        definition = get_synset_gloss(s)
+        if len(definition) > 80:
+            definition = definition[:80] + "..."
+
+        label = f"{s.name()} ({get_synset_wnid(s)}): {definition}"
+        choices.append((label, s.name()))
+    return tuple(choices)
+
+
+def _warm_wordnet() -> None:
+    """Load WordNet in the background so the first lookup or generation does not wait for it."""
+    try:
+        from wildcards_gen.core.wordnet import ensure_nltk_data
+
+        ensure_nltk_data()
+    except Exception as e:
+        logger.warning(f"WordNet warm-up failed: {e}")
 
 
 def search_wordnet(query):
@@ -165,25 +349,12 @@ def search_wordnet(query):
         return gr.update(visible=False), gr.update(value="Please enter at least 2 characters.", visible=True)
 
     try:
-        synsets = wn.synsets(query.replace(" ", "_"))
-        if not synsets:
+        # WordNet lookups are case-insensitive, so normalize before hitting the cache
+        choices = _wordnet_choices(query.replace(" ", "_").lower())
+        if not choices:
             return gr.update(visible=False), gr.update(value=f"No results found for '{query}'.", visible=True)
 
-        choices = []
-        for s in synsets[:15]:  # Limit to top 15
-            wnid = f"{s.pos()}{s.offset():08d}"
-            # Label: dog.n.01 (n02084071): a domesticated carnivorous...
-            # Value: dog.n.01
-            # Truncate definition to keep UI clean
-            definition = s.definition()
-            if len(definition) > 80:
-                definition = definition[:80] + "..."
-
-            label = f"{s.name()} ({wnid}): {definition}"
-            value = s.name()
-            choices.append((label, value))
-
-        return gr.update(choices=choices, visible=True, value=None), gr.update(value="", visible=False)
+        return gr.update(choices=list(choices), visible=True, value=None), gr.update(value="", visible=False)
     except Exception as e:
         return gr.update(visible=False), gr.update(value=f"Error: {str(e)}", visible=True)
 
@@ -191,7 +362,7 @@ def search_wordnet(query):
 def update_ds_ui(dataset_name, strategy):
     """Calculate visibility and state updates for dataset-related UI components."""
     is_imagenet = dataset_name == "ImageNet"
-    can_use_smart = dataset_name in ["ImageNet", "Open Images", "Tencent ML-Images"]
+    can_use_smart = dataset_name in SMART_DATASETS
     is_smart = (strategy == "Smart") and can_use_smart
     new_strategy = "Smart" if (can_use_smart and dataset_name != "COCO") else strategy
 
@@ -216,12 +387,7 @@ def on_dataset_change(dataset_name, strategy):
     visibility_updates = update_ds_ui(dataset_name, strategy)
 
     # 2. Update the info markdown
-    info_text = {
-        "ImageNet": "_**ImageNet**: 21k classes. Best for general objects/animals._",
-        "COCO": "_**COCO**: 80 objects. Very small, flat list._",
-        "Open Images": "_**Open Images V7**: ~600 bbox classes or 20k+ image labels._",
-        "Tencent ML-Images": "_**Tencent ML**: 11k categories. Massive, modern coverage._",
-    }.get(dataset_name, "")
+    info_text = DATASET_INFO.get(dataset_name, "")
 
     # Returns: visibility_updates (5) + info_update (1)
     return visibility_updates + [gr.update(value=info_text)]
@@ -257,6 +423,7 @@ def generate_dataset_handler(
     min_samples=5,
     orphans_template="misc",
     fast_preview=False,
+    serve=True,
     progress=gr.Progress(),
 ):
     progress(0, desc="Initializing...")
@@ -319,14 +486,19 @@ def generate_dataset_handler(
                 "exclude_regex": exclude_regex,
                 "exclude_subtree": exclude_subtree,
                 "smart": is_smart,
+                "progress_callback": progress,
             }
             if is_smart:
                 kwargs.update(smart_kwargs)
 
+            from wildcards_gen.core.datasets import imagenet
+
             data = cast(Any, imagenet.generate_imagenet_tree(**kwargs))
 
         elif dataset_name == "COCO":
             progress(0.2, desc="Loading COCO API...")
+            from wildcards_gen.core.datasets import coco
+
             data = cast(Any, coco.generate_coco_hierarchy(with_glosses=with_glosses))
         elif dataset_name == "Open Images":
             progress(0.2, desc="Loading Open Images metadata...")
@@ -340,6 +512,8 @@ def generate_dataset_handler(
             if is_smart:
                 kwargs.update(smart_kwargs)
 
+            from wildcards_gen.core.datasets import openimages
+
             data = cast(Any, openimages.generate_openimages_hierarchy(**kwargs))
 
         elif dataset_name == "Tencent ML-Images":
@@ -348,15 +522,19 @@ def generate_dataset_handler(
                 "max_depth": int(depth),
                 "with_glosses": with_glosses,
                 "smart": is_smart,
+                "progress_callback": progress,
             }
             if is_smart:
                 kwargs.update(smart_kwargs)
 
+            from wildcards_gen.core.datasets import tencent
+
             data = cast(Any, tencent.generate_tencent_hierarchy(**kwargs))
 
         # 3. Process via HierarchyBuilder (converts TaxonomyNode -> CommentedMap)
+        from wildcards_gen.core.builder import HierarchyBuilder, TaxonomyNode
+
         if data is not None and isinstance(data, TaxonomyNode):
-            from wildcards_gen.core.builder import HierarchyBuilder
             from wildcards_gen.core.smart import SmartConfig
 
             # Reconstruct SmartConfig from parameters
@@ -383,22 +561,22 @@ def generate_dataset_handler(
             else:
                 data = builder._to_commented_map(data)
 
-        output_path, preview = save_and_preview(data, output_name)
+        output_path, preview = save_and_preview(data, output_name, serve=serve)
 
         # Save Stats
         if config.get("generation.save_stats"):
             # Always save stats to the configured output directory
             filename = os.path.basename(output_path)
             stem = os.path.splitext(filename)[0]
+            # save_and_preview has just written into this directory
             base_path = os.path.join(config.output_dir, stem)
-            os.makedirs(config.output_dir, exist_ok=True)
 
             stats.save_to_json(f"{base_path}.stats.json")
             stats.save_summary_log(f"{base_path}.log")
 
         # No summary markdown anymore, just duration and status
         summary_md = "### ✅ Generation Complete\n"
-        summary_md += f"* **Total Duration**: {stats.to_dict()['execution']['duration_seconds']}s\n"
+        summary_md += f"* **Total Duration**: {stats.duration_seconds()}s\n"
 
         # Check for limit reached
         limit_events = [e for e in stats.events if e.event_type == "limit_reached"]
@@ -408,9 +586,13 @@ def generate_dataset_handler(
                 f"\n> [!WARNING]\n> **Fast Preview Limit Reached**\n> Processed {limit_val} items. Output is truncated."
             )
 
-        # Return summary and list of files [yaml, log, json]
+        # Return summary and list of files [yaml, log, json]; like the YAML,
+        # the stats files are linked into Gradio's folder rather than copied
         log_path = f"{base_path}.log"
         json_path = f"{base_path}.stats.json"
+        if serve:
+            log_path = _served_path(log_path)
+            json_path = _served_path(json_path)
 
         return preview, summary_md, [output_path, log_path, json_path]
     except Exception as e:
@@ -418,6 +600,35 @@ def generate_dataset_handler(
         return f"Error: {str(e)}", "", []
 
 
+def generate_dataset_stream(*args):
+    """
+    Run generate_dataset_handler on a worker thread and stream its progress.
+
+    Yields status updates into the summary panel while the generation runs,
+    then the handler's final (preview, summary, files) tuple. If the client
+    disconnects, Gradio closes the generator; the worker is then told to stop
+    at its next progress report and is not waited for, so the event's
+    concurrency slot is released right away.
+    """
+    updates: queue.Queue = queue.Queue()
+    cancelled = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        handler_kwargs: Dict[str, Any] = {"progress": QueueProgress(updates, cancelled)}
+        future = pool.submit(generate_dataset_handler, *args, **handler_kwargs)
+        while not future.done() or not updates.empty():
+            try:
+                _, desc = updates.get(timeout=0.25)
+            except queue.Empty:
+                continue
+            if desc:
+                yield gr.update(), f"### ⏳ {desc}", gr.update()
+        yield future.result()
+    finally:
+        cancelled.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def live_preview_handler(*args):
     """Wrapper for auto-generation that only fires if Fast Preview is checked."""
     # Robust argument handling: Look for boolean at end, or scan args
@@ -432,15 +643,133 @@ def live_preview_handler(*args):
     if not is_fast_preview:
         return gr.update(), gr.update(), gr.update()
 
-    # Call the main handler but suppress error spam in preview
+    # Call the main handler but suppress error spam in preview; the files
+    # are not offered for download, so nothing is linked for Gradio
     try:
-        preview, summary_md, _ = generate_dataset_handler(*args)
+        handler_kwargs: Dict[str, Any] = {"serve": False}
+        preview, summary_md, _ = generate_dataset_handler(*args, **handler_kwargs)
         return preview, summary_md, gr.update()
     except Exception as e:
         # Don't break the UI, just show nothing or a subtle message
         return f"# Error during preview: {str(e)}", "", gr.update()
 
 
+def _analysis_summary(
+    dataset_name, root, depth, filter_set, strict_filter, blacklist_abstract, bbox_only, progress
+) -> Tuple[Any, Dict[str, int]]:
+    """Build the full hierarchy for a dry run and return its stats and suggested thresholds."""
+    if dataset_name == "ImageNet":
+        # Force non-smart for analysis
+        from wildcards_gen.core.datasets import imagenet
+
+        data = imagenet.generate_imagenet_tree(
+            root,
+            max_depth=depth,
+            filter_set=filter_set if filter_set != "none" else None,
+            with_glosses=False,
+            strict_filter=strict_filter,
+            blacklist_abstract=blacklist_abstract,
+            smart=False,
+            progress_callback=progress,
+        )
+    elif dataset_name == "Open Images":
+        # OpenImages needs smart=True but permissive to see structure
+        from wildcards_gen.core.datasets import openimages
+
+        data = openimages.generate_openimages_hierarchy(
+            max_depth=depth,
+            with_glosses=False,
+            smart=True,
+            min_significance_depth=20,
+            min_hyponyms=0,
+            min_leaf_size=0,
+            bbox_only=bbox_only,
+            progress_callback=progress,
+        )
+    elif dataset_name == "Tencent ML-Images":
+        from wildcards_gen.core.datasets import tencent
+
+        data = tencent.generate_tencent_hierarchy(
+            max_depth=depth,
+            with_glosses=False,
+            smart=True,
+            min_significance_depth=20,
+            min_hyponyms=0,
+            min_leaf_size=0,
+            progress_callback=progress,
+        )
+    else:
+        raise ValueError(f"Analysis not supported for {dataset_name}")
+
+    # Convert TaxonomyNode to dict for analysis if needed
+    from wildcards_gen.core.builder import HierarchyBuilder, TaxonomyNode
+
+    if data is not None and isinstance(data, TaxonomyNode):
+        from wildcards_gen.core.smart import SmartConfig
+
+        builder = HierarchyBuilder(SmartConfig(enabled=False))
+        data = builder._to_commented_map(data)
+
+    stats = analyze.compute_dataset_stats(cast(Any, data))
+    return stats, analyze.suggest_thresholds(stats)
+
+
+def _analysis_sources(dataset_name: str) -> Tuple[Tuple[str, int, int], ...]:
+    """(name, st_mtime_ns, st_size) for each source file of dataset_name present on disk."""
+    from wildcards_gen.core.datasets.downloaders import DOWNLOADS_DIR
+
+    signature = []
+    for name in ANALYSIS_SOURCE_FILES.get(dataset_name, ()):
+        try:
+            st = os.stat(os.path.join(DOWNLOADS_DIR, name))
+        except OSError:
+            continue
+        signature.append((name, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _analysis_store() -> sqlite3.Connection:
+    conn = sqlite3.connect(config.db_path, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_summaries (
+            key TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            created REAL NOT NULL
+        )
+    """)
+    return conn
+
+
+def _load_stored_analysis(key: Tuple[Any, ...]) -> Optional[Tuple[Dict[str, Any], Dict[str, int]]]:
+    """Return a persisted (stats, thresholds) pair younger than ANALYSIS_STORE_MAX_AGE."""
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    try:
+        with _analysis_store() as conn:
+            row = conn.execute(
+                "SELECT summary FROM analysis_summaries WHERE key = ? AND created > ?",
+                (digest, time.time() - ANALYSIS_STORE_MAX_AGE),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.debug(f"Analysis store read failed: {e}")
+        return None
+    if row is None:
+        return None
+    stats, tuned = json.loads(row[0])
+    return stats, tuned
+
+
+def _store_analysis(key: Tuple[Any, ...], summary: Tuple[Dict[str, Any], Dict[str, int]]) -> None:
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    try:
+        with _analysis_store() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_summaries (key, summary, created) VALUES (?, ?, ?)",
+                (digest, json.dumps(summary), time.time()),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Analysis store write failed: {e}")
+
+
 def analyze_handler(
     dataset_name,
     root,
@@ -455,48 +784,16 @@ def analyze_handler(
     """Run dry-run analysis and return report + suggestions."""
     progress(0, desc="Analyzing structure...")
     try:
-        data = None
-        if dataset_name == "ImageNet":
-            if not root:
-                return (
-                    "Error: Root required",
-                    4,
-                    50,
-                    5,
-                    history,
-                    gr.update(visible=False),
-                )
-            # Force non-smart for analysis
-            data = imagenet.generate_imagenet_tree(
-                root,
-                max_depth=max(int(depth), 10),
-                filter_set=filter_set if filter_set != "none" else None,
-                with_glosses=False,
-                strict_filter=strict_filter,
-                blacklist_abstract=blacklist_abstract,
-                smart=False,
-            )
-        elif dataset_name == "Open Images":
-            # OpenImages needs smart=True but permissive to see structure
-            data = openimages.generate_openimages_hierarchy(
-                max_depth=max(int(depth), 10),
-                with_glosses=False,
-                smart=True,
-                min_significance_depth=20,
-                min_hyponyms=0,
-                min_leaf_size=0,
-                bbox_only=bbox_only,
-            )
-        elif dataset_name == "Tencent ML-Images":
-            data = tencent.generate_tencent_hierarchy(
-                max_depth=max(int(depth), 10),
-                with_glosses=False,
-                smart=True,
-                min_significance_depth=20,
-                min_hyponyms=0,
-                min_leaf_size=0,
+        if dataset_name == "ImageNet" and not root:
+            return (
+                "Error: Root required",
+                4,
+                50,
+                5,
+                history,
+                gr.update(visible=False),
             )
-        else:
+        if dataset_name not in SMART_DATASETS:
             return (
                 "Analysis not supported for this dataset.",
                 4,
@@ -506,26 +803,41 @@ def analyze_handler(
                 gr.update(visible=False),
             )
 
-        # Convert TaxonomyNode to dict for analysis if needed
-        if data is not None and isinstance(data, TaxonomyNode):
-            from wildcards_gen.core.builder import HierarchyBuilder
-            from wildcards_gen.core.smart import SmartConfig
-
-            builder = HierarchyBuilder(SmartConfig(enabled=False))
-            data = builder._to_commented_map(data)
-
-        from wildcards_gen.core import analyze
-
-        stats = analyze.compute_dataset_stats(cast(Any, data))
-        tuned = analyze.suggest_thresholds(stats)
+        # Key on the inputs each dataset actually uses, at the depth actually built
+        depth = max(int(depth), 10)
+        if dataset_name == "ImageNet":
+            inputs: Tuple[Any, ...] = (dataset_name, root, depth, filter_set, strict_filter, blacklist_abstract)
+        else:
+            inputs = (dataset_name, depth, bbox_only and dataset_name == "Open Images")
+        key = inputs + (_analysis_sources(dataset_name),)
+
+        with _ANALYSIS_CACHE_LOCK:
+            cached = _ANALYSIS_CACHE.get(key)
+            if cached is not None:
+                _ANALYSIS_CACHE.move_to_end(key)
+        if cached is None:
+            cached = _load_stored_analysis(key)
+            if cached is None:
+                stats_obj, tuned = _analysis_summary(
+                    dataset_name, root, depth, filter_set, strict_filter, blacklist_abstract, bbox_only, progress
+                )
+                cached = (stats_obj.to_dict(), tuned)
+                # The run may have downloaded the sources; key on what it read
+                key = inputs + (_analysis_sources(dataset_name),)
+                _store_analysis(key, cached)
+            with _ANALYSIS_CACHE_LOCK:
+                _ANALYSIS_CACHE[key] = cached
+                if len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+                    _ANALYSIS_CACHE.popitem(last=False)
+        stats, tuned = cached
 
         report = f"""
 ### 📊 Analysis Report
-* **Max Depth**: {stats.max_depth}
-* **Total Nodes**: {stats.total_nodes}
-* **Total Leaves**: {stats.total_leaves}
-* **Avg Branching**: {stats.to_dict()["avg_branching"]}
-* **Avg Leaf Size**: {stats.to_dict()["avg_leaf_size"]}
+* **Max Depth**: {stats["max_depth"]}
+* **Total Nodes**: {stats["total_nodes"]}
+* **Total Leaves**: {stats["total_leaves"]}
+* **Avg Branching**: {stats["avg_branching"]}
+* **Avg Leaf Size**: {stats["avg_leaf_size"]}
 
 ### 💡 Suggestions
 * **Min Depth**: {tuned["min_depth"]}
@@ -534,7 +846,7 @@ def analyze_handler(
 """
         # Update history
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        entry = f"**{timestamp}**: {stats.total_nodes} nodes, {stats.total_leaves} leaves"
+        entry = f"**{timestamp}**: {stats['total_nodes']} nodes, {stats['total_leaves']} leaves"
         history = [entry] + history if history else [entry]
         # Keep last 10 entries for state
         history = history[:10]
@@ -561,13 +873,19 @@ def create_handler(topic, model, api_key, output_name):
             "Error: API Key required for LLM features. Set it in the Settings tab.",
         )
     try:
-        engine = LLMEngine(api_key=api_key, model=model)
-        mgr = StructureManager()
-
-        logger.info(f"GUI: Creating taxonomy for {topic}")
-        yaml_str = engine.generate_dynamic_structure(topic)
-        if not yaml_str:
-            return None, "Error: LLM failed to generate structure."
+        mgr = _structure_manager()
+        cache = _response_cache()
+
+        # Similar topics only share a skeleton when semantic matching is opted into
+        semantic = config.llm_cache_semantic
+        yaml_str = cache.get("create", model, topic, semantic=semantic) if cache else None
+        if yaml_str is None:
+            logger.info(f"GUI: Creating taxonomy for {topic}")
+            yaml_str = _llm_engine(api_key, model).generate_dynamic_structure(topic)
+            if not yaml_str:
+                return None, "Error: LLM failed to generate structure."
+            if cache:
+                cache.put("create", model, topic, yaml_str, semantic=semantic)
 
         data = mgr.from_string(yaml_str)
         return save_and_preview(data, output_name)
@@ -580,12 +898,19 @@ def categorize_handler(terms_text, model, api_key, output_name):
     if not api_key:
         return None, "Error: API Key required. Set it in the Settings tab."
     try:
-        terms = [t.strip() for t in terms_text.split("\n") if t.strip()]
+        terms = [term for line in terms_text.splitlines() if (term := line.strip())]
         if not terms:
             return None, "Error: No terms provided."
 
-        engine = LLMEngine(api_key=api_key, model=model)
-        mgr = StructureManager()
+        mgr = _structure_manager()
+        cache = _response_cache()
+        cache_input = "\n".join(terms)
+
+        cached = cache.get("categorize", model, cache_input) if cache else None
+        if cached is not None:
+            return save_and_preview(mgr.from_string(cached), output_name)
+
+        engine = _llm_engine(api_key, model)
 
         # 1. Generate skeleton from samples
         logger.info(f"GUI: Categorizing {len(terms)} terms")
@@ -600,6 +925,8 @@ def categorize_handler(terms_text, model, api_key, output_name):
         categorized = engine.categorize_terms(terms, structure_yaml)
         if categorized:
             mgr.merge_categorized_data(structure, categorized)
+            if cache:
+                cache.put("categorize", model, cache_input, mgr.to_string(structure))
 
         return save_and_preview(structure, output_name)
     except Exception as e:
@@ -611,16 +938,21 @@ def enrich_handler(input_yaml, topic, model, api_key, output_name):
     if not api_key:
         return None, "Error: API Key required. Set it in the Settings tab."
     try:
-        engine = LLMEngine(api_key=api_key, model=model)
-        mgr = StructureManager()
+        mgr = _structure_manager()
 
         if not input_yaml.strip():
             return None, "Error: No YAML content provided."
 
-        logger.info(f"GUI: Enriching instructions for topic {topic}")
-        enriched_yaml = engine.enrich_instructions(input_yaml, topic)
-        if not enriched_yaml:
-            return None, "Error: Enrichment failed."
+        cache = _response_cache()
+        cache_input = f"{topic}\0{input_yaml}"
+        enriched_yaml = cache.get("enrich", model, cache_input) if cache else None
+        if enriched_yaml is None:
+            logger.info(f"GUI: Enriching instructions for topic {topic}")
+            enriched_yaml = _llm_engine(api_key, model).enrich_instructions(input_yaml, topic)
+            if not enriched_yaml:
+                return None, "Error: Enrichment failed."
+            if cache:
+                cache.put("enrich", model, cache_input, enriched_yaml)
 
         enriched = mgr.from_string(enriched_yaml)
         return save_and_preview(enriched, output_name)
@@ -635,11 +967,9 @@ def lint_handler(file_obj, model, threshold, progress=gr.Progress()):
 
     progress(0, desc="Loading model... (this may take a moment)")
     try:
-        from wildcards_gen.core.linter import clean_structure, lint_file
-
         output_path = file_obj.name
         # Run Lint - returns report and the original structure object
-        result, structure = lint_file(output_path, model, float(threshold))
+        result, structure = linter.lint_file(output_path, model, float(threshold))
         issues = result.get("issues", [])
 
         if not issues:
@@ -662,20 +992,17 @@ def lint_handler(file_obj, model, threshold, progress=gr.Progress()):
                 report += f"| **{score:.2f}** | `{term}` | `{path}` |\n"
 
         # 3. Create cleaned version
-        clean_data = clean_structure(structure, result)
+        clean_data = linter.clean_structure(structure, result)
 
         # Save to temp file for download
-        from wildcards_gen.core.structure import StructureManager
-
-        mgr = StructureManager()
+        mgr = _structure_manager()
 
-        base_name = os.path.basename(output_path).replace(".yaml", "")
-        clean_filename = f"{base_name}_cleaned.yaml"
-        clean_path = os.path.join(os.path.dirname(output_path), clean_filename)
+        # Sibling of the upload; only the extension is dropped, not '.yaml' inside the name
+        clean_path = f"{os.path.splitext(output_path)[0]}_cleaned.yaml"
 
         # Use StructureManager to format the output
-        with open(clean_path, "w", encoding="utf-8") as f:
-            f.write(mgr.to_string(clean_data))
+        with open(clean_path, "wb") as f:
+            mgr.to_file(clean_data, f)
 
         return report, gr.update(visible=True), clean_path
 
@@ -692,7 +1019,8 @@ def launch_gui(share=False, port=None):
     initial_key = config.api_key or os.environ.get("OPENROUTER_API_KEY", "")
     initial_hf_token = config.get("hf_token") or os.environ.get("HF_TOKEN", "")
 
-    with gr.Blocks(title="Wildcards-Gen") as demo:
+    # A local tool: skip Gradio's usage telemetry requests on launch and events
+    with gr.Blocks(title="Wildcards-Gen", analytics_enabled=False) as demo:
         # Header with API Key Status
         with gr.Row(elem_classes=["header-section"]):
             with gr.Column(scale=4):
@@ -707,10 +1035,6 @@ def launch_gui(share=False, port=None):
         api_key_state = gr.State(initial_key)
         model_state = gr.State(config.model)
 
-        # Global State
-        api_key_state = gr.State(initial_key)
-        model_state = gr.State(config.model)
-
         with gr.Tabs():
             # === TAB 1: CV DATASETS (Local) ===
             with gr.Tab("📸 CV Datasets"):
@@ -769,15 +1093,14 @@ def launch_gui(share=False, port=None):
                                             info="Click a synset to populate the Root Synset field.",
                                         )
 
-                                        search_btn.click(
-                                            search_wordnet,
-                                            inputs=[search_in],
-                                            outputs=[search_results, search_msg],
-                                        )
-                                        search_in.submit(
+                                        # Lookups are cached and take milliseconds, so
+                                        # searches need not queue behind each other
+                                        gr.on(
+                                            [search_btn.click, search_in.submit],
                                             search_wordnet,
                                             inputs=[search_in],
                                             outputs=[search_results, search_msg],
+                                            concurrency_limit=None,
                                         )
 
                                         search_results.change(
@@ -1035,16 +1358,18 @@ def launch_gui(share=False, port=None):
                                     elem_classes=["preview-code"],
                                 )
                                 cr_file = gr.File(label="Download")
-                        cr_topic.change(update_cr_filename, inputs=[cr_topic], outputs=[cr_out])
+                        cr_topic.change(update_cr_filename, inputs=[cr_topic], outputs=[cr_out], **FILENAME_EVENT_KW)
                         cr_btn.click(
                             create_handler,
                             inputs=[cr_topic, model_state, api_key_state, cr_out],
                             outputs=[cr_file, cr_prev],
+                            **LLM_EVENT_KW,
                         )
                         cr_topic.submit(
                             create_handler,
                             inputs=[cr_topic, model_state, api_key_state, cr_out],
                             outputs=[cr_file, cr_prev],
+                            **LLM_EVENT_KW,
                         )
 
                     # Subtab: Categorize
@@ -1067,11 +1392,13 @@ def launch_gui(share=False, port=None):
                                     elem_classes=["preview-code"],
                                 )
                                 cat_file = gr.File(label="Download")
-                        cat_terms.change(update_cat_filename, inputs=[cat_terms], outputs=[cat_out])
+                        # The term list can be huge: refresh on blur rather than upload it per keystroke
+                        cat_terms.blur(update_cat_filename, inputs=[cat_terms], outputs=[cat_out], **FILENAME_EVENT_KW)
                         cat_btn.click(
                             categorize_handler,
                             inputs=[cat_terms, model_state, api_key_state, cat_out],
                             outputs=[cat_file, cat_prev],
+                            **LLM_EVENT_KW,
                         )
 
                     # Subtab: Enrich
@@ -1098,7 +1425,7 @@ def launch_gui(share=False, port=None):
                                     elem_classes=["preview-code"],
                                 )
                                 en_file = gr.File(label="Download")
-                        en_topic.change(update_en_filename, inputs=[en_topic], outputs=[en_out])
+                        en_topic.change(update_en_filename, inputs=[en_topic], outputs=[en_out], **FILENAME_EVENT_KW)
                         en_btn.click(
                             enrich_handler,
                             inputs=[
@@ -1109,6 +1436,7 @@ def launch_gui(share=False, port=None):
                                 en_out,
                             ],
                             outputs=[en_file, en_prev],
+                            **LLM_EVENT_KW,
                         )
                         en_topic.submit(
                             enrich_handler,
@@ -1120,6 +1448,7 @@ def launch_gui(share=False, port=None):
                                 en_out,
                             ],
                             outputs=[en_file, en_prev],
+                            **LLM_EVENT_KW,
                         )
 
             # === TAB 3: QUALITY CONTROL ===
@@ -1243,8 +1572,15 @@ def launch_gui(share=False, port=None):
             ds_min_leaf,
             ds_bbox_only,
         ]
-        for comp in config_inputs:
-            comp.change(update_ds_filename, inputs=config_inputs, outputs=[ds_out_name])  # type: ignore[attr-defined]
+        # One listener for all inputs, so always_last coalesces edits across
+        # components instead of queueing one recompute per changed field.
+        gr.on(
+            [comp.change for comp in config_inputs],  # type: ignore[attr-defined]
+            update_ds_filename,
+            inputs=config_inputs,
+            outputs=[ds_out_name],
+            **FILENAME_EVENT_KW,
+        )
 
         # Dataset Generation components
         all_gen_inputs = [
@@ -1297,22 +1633,22 @@ def launch_gui(share=False, port=None):
             ds_arr_samples.change,
         ]
 
-        # Wire each trigger to the live_preview_handler
-        # Note: Gradio 6.x uses 'always_last' as the default for .change() events
-        for trigger in live_preview_triggers:
-            trigger(
-                live_preview_handler,
-                inputs=all_gen_inputs,
-                outputs=[ds_prev, ds_summary, ds_file],
-                concurrency_limit=1,
-                show_progress="hidden",
-            )
+        # One event for all triggers: always_last then coalesces across them, so a
+        # preset that moves seven sliders queues one rebuild rather than seven
+        gr.on(
+            live_preview_triggers,
+            live_preview_handler,
+            inputs=all_gen_inputs,
+            outputs=[ds_prev, ds_summary, ds_file],
+            concurrency_limit=1,
+            trigger_mode="always_last",
+            show_progress="hidden",
+        )
 
         # Smart Presets
         def apply_smart_preset(p, dataset_name):
-            if dataset_name in DATASET_PRESET_OVERRIDES and p in DATASET_PRESET_OVERRIDES[dataset_name]:
-                return DATASET_PRESET_OVERRIDES[dataset_name][p]
-            return SMART_PRESETS.get(p, [gr.update()] * 7)
+            preset = DATASET_PRESET_OVERRIDES.get(dataset_name, {}).get(p) or SMART_PRESETS.get(p)
+            return preset if preset is not None else [gr.update()] * 7
 
         ds_smart_preset.change(
             apply_smart_preset,
@@ -1328,12 +1664,18 @@ def launch_gui(share=False, port=None):
             ],
         )
 
+        # Generation is CPU-bound and holds the GIL: run one at a time
         ds_btn.click(
-            generate_dataset_handler,
+            generate_dataset_stream,
             inputs=all_gen_inputs,
             outputs=[ds_prev, ds_summary, ds_file],
+            concurrency_limit=1,
         )
 
+    demo.queue(max_size=QUEUE_MAX_SIZE)
+    # NLTK is imported lazily to keep startup fast; load it while the UI comes up
+    threading.Thread(target=_warm_wordnet, name="wordnet-warmup", daemon=True).start()
+
     # Configure logging to reduce spam
     logging.getLogger("transformers").setLevel(logging.ERROR)
     logging.getLogger("sentence_transformers").setLevel(logging.WARNING)